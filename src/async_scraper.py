@@ -16,7 +16,7 @@ import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
@@ -29,6 +29,7 @@ from bs4 import BeautifulSoup
 sys.path.insert(0, str(Path(__file__).parent))
 
 from logging_config import get_logger
+from rss_parser import parse_feed
 
 logger = get_logger(__name__)
 
@@ -108,16 +109,16 @@ class AsyncDomainRateLimiter:
             elapsed = current_time - last_time
 
             if elapsed < self.min_delay:
-                wait_time = self.min_delay - elapsed
-                # Release lock while sleeping
-                self._last_request_time[domain] = current_time + wait_time
-                await asyncio.sleep(wait_time)
-                waited = wait_time
+                # Reserve the domain's next slot, then sleep outside the lock so
+                # requests to other domains aren't held up behind this one
+                waited = self.min_delay - elapsed
+                self._last_request_time[domain] = current_time + waited
             else:
                 self._last_request_time[domain] = current_time
                 waited = 0.0
 
         if waited > 0:
+            await asyncio.sleep(waited)
             logger.debug(
                 "Rate limited", extra={"domain": domain, "wait_seconds": round(waited, 2)}
             )
@@ -629,8 +630,9 @@ class AsyncRSSScraper(AsyncBaseScraper):
                     await self.http_cache.update_cache(feed_url, dict(response.headers))
                     self.http_cache.record_miss()
 
-                # Parse feed
-                feed = feedparser.parse(content)
+                # Parse feed on a worker thread, as parsing on the event loop
+                # would stall every other feed's fetch
+                feed = await asyncio.to_thread(parse_feed, content)
                 return feed, True
 
         except asyncio.TimeoutError:
@@ -660,81 +662,97 @@ class AsyncRSSScraper(AsyncBaseScraper):
         return None, None
 
     async def scrape(self) -> List[ArticleData]:
-        """Scrape RSS feeds"""
+        """
+        Scrape RSS feeds
+
+        Feeds are fetched concurrently, so a source's scrape takes about as long
+        as its slowest feed rather than the sum of them; the domain rate limiter
+        still spaces out requests to the same host.
+        """
         articles: List[ArticleData] = []
         rss_feeds = self.config.get("rss_feeds", [])
 
-        for feed_url in rss_feeds:
-            # Check if feed should be skipped
-            if self.feed_health_tracker:
-                should_skip, reason = await self.feed_health_tracker.should_skip_feed(feed_url)
-                if should_skip:
-                    logger.info("Skipping dead feed", extra={"feed_url": feed_url, "reason": reason})
-                    continue
+        feeds_articles = await asyncio.gather(
+            *(self._scrape_feed(feed_url) for feed_url in rss_feeds)
+        )
+        for feed_articles in feeds_articles:
+            articles.extend(feed_articles)
 
-            logger.info("Fetching RSS feed", extra={"feed_url": feed_url})
+        logger.info(
+            "RSS scraper complete",
+            extra={"source": self.config.get("name", "RSS"), "articles": len(articles)},
+        )
+        return articles
 
-            try:
-                feed, was_modified = await self._fetch_feed_with_cache(feed_url)
+    async def _scrape_feed(self, feed_url: str) -> List[ArticleData]:
+        """Fetch one RSS feed and parse its entries"""
+        articles: List[ArticleData] = []
 
-                # Handle fetch result
-                if was_modified is None:
-                    # Fetch failed
-                    continue
-                elif was_modified is False:
-                    # Feed not modified (304) - success
-                    logger.info("Feed not modified, skipping", extra={"feed_url": feed_url})
-                    if self.feed_health_tracker:
-                        await self.feed_health_tracker.record_success(feed_url)
-                    continue
-                elif feed is None:
-                    logger.warning(
-                        "Unexpected state: was_modified=True but feed is None",
-                        extra={"feed_url": feed_url},
-                    )
-                    continue
+        # Check if feed should be skipped
+        if self.feed_health_tracker:
+            should_skip, reason = await self.feed_health_tracker.should_skip_feed(feed_url)
+            if should_skip:
+                logger.info("Skipping dead feed", extra={"feed_url": feed_url, "reason": reason})
+                return articles
+
+        logger.info("Fetching RSS feed", extra={"feed_url": feed_url})
 
-                # Feed fetched successfully
+        try:
+            feed, was_modified = await self._fetch_feed_with_cache(feed_url)
+
+            # Handle fetch result
+            if was_modified is None:
+                # Fetch failed
+                return articles
+            elif was_modified is False:
+                # Feed not modified (304) - success
+                logger.info("Feed not modified, skipping", extra={"feed_url": feed_url})
                 if self.feed_health_tracker:
                     await self.feed_health_tracker.record_success(feed_url)
+                return articles
+            elif feed is None:
+                logger.warning(
+                    "Unexpected state: was_modified=True but feed is None",
+                    extra={"feed_url": feed_url},
+                )
+                return articles
 
-                # Process feed entries
-                entries = feed.entries[:50] if hasattr(feed, "entries") else []
-                for entry in entries:
-                    try:
-                        article = await self._parse_entry(entry, feed_url)
-                        if article:
-                            articles.append(article)
-                    except (KeyError, AttributeError) as e:
-                        logger.warning(
-                            "Error parsing RSS entry",
-                            extra={"feed_url": feed_url, "error": str(e)},
-                        )
-                        continue
-                    except Exception as e:
-                        logger.error(
-                            "Unexpected error parsing RSS entry",
-                            extra={
-                                "feed_url": feed_url,
-                                "error": str(e),
-                                "error_type": type(e).__name__,
-                            },
-                        )
-                        continue
+            # Feed fetched successfully
+            if self.feed_health_tracker:
+                await self.feed_health_tracker.record_success(feed_url)
+
+            # Process feed entries
+            entries = feed.entries[:50] if hasattr(feed, "entries") else []
+            for entry in entries:
+                try:
+                    article = await self._parse_entry(entry, feed_url)
+                    if article:
+                        articles.append(article)
+                except (KeyError, AttributeError) as e:
+                    logger.warning(
+                        "Error parsing RSS entry",
+                        extra={"feed_url": feed_url, "error": str(e)},
+                    )
+                    continue
+                except Exception as e:
+                    logger.error(
+                        "Unexpected error parsing RSS entry",
+                        extra={
+                            "feed_url": feed_url,
+                            "error": str(e),
+                            "error_type": type(e).__name__,
+                        },
+                    )
+                    continue
 
-            except Exception as e:
-                logger.error(
-                    "Error processing RSS feed",
-                    extra={"feed_url": feed_url, "error": str(e), "error_type": type(e).__name__},
-                )
-                if self.feed_health_tracker:
-                    await self.feed_health_tracker.record_failure(feed_url)
-                continue
+        except Exception as e:
+            logger.error(
+                "Error processing RSS feed",
+                extra={"feed_url": feed_url, "error": str(e), "error_type": type(e).__name__},
+            )
+            if self.feed_health_tracker:
+                await self.feed_health_tracker.record_failure(feed_url)
 
-        logger.info(
-            "RSS scraper complete",
-            extra={"source": self.config.get("name", "RSS"), "articles": len(articles)},
-        )
         return articles
 
     async def _parse_entry(self, entry: Any, feed_url: str) -> Optional[ArticleData]:
@@ -797,8 +815,17 @@ class AsyncScraperManager:
         "cnbc": AsyncRSSScraper,
     }
 
-    def __init__(self, config_path: str = "config/settings.yaml"):
-        self.config = self._load_config(config_path)
+    def __init__(
+        self,
+        config_path: str = "config/settings.yaml",
+        config: Optional[Dict[str, Any]] = None,
+        connection_limit: int = 100,
+        per_host_limit: int = 10,
+    ):
+        # An already-parsed config (e.g. from ScraperManager) skips the YAML load
+        self.config = config if config is not None else self._load_config(config_path)
+        self.connection_limit = connection_limit
+        self.per_host_limit = per_host_limit
         self.session: Optional[aiohttp.ClientSession] = None
         self.rate_limiter: Optional[AsyncDomainRateLimiter] = None
         self.http_cache: Optional[AsyncHTTPCache] = None
@@ -857,8 +884,8 @@ class AsyncScraperManager:
 
         # Create aiohttp session with connection pooling
         connector = TCPConnector(
-            limit=100,  # Total concurrent connections
-            limit_per_host=10,  # Per-host connections
+            limit=self.connection_limit,  # Total concurrent connections
+            limit_per_host=self.per_host_limit,  # Per-host connections
             ttl_dns_cache=300,
             use_dns_cache=True,
         )
@@ -940,11 +967,21 @@ class AsyncScraperManager:
         Returns:
             List of unique ArticleData objects
         """
+        return [article async for article in self.scrape_all_iter(max_concurrent)]
+
+    async def scrape_all_iter(self, max_concurrent: int = 10) -> AsyncIterator[ArticleData]:
+        """
+        Run all scrapers concurrently, yielding unique articles as each source finishes.
+
+        Lets callers process and persist articles in bounded chunks instead of
+        holding the whole cycle's scrape in memory.
+
+        Args:
+            max_concurrent: Maximum number of scrapers to run concurrently
+        """
         if not self.session:
             raise RuntimeError("ScraperManager not initialized. Use async context manager.")
 
-        all_articles: List[ArticleData] = []
-
         # Reset cache statistics
         if self.http_cache:
             self.http_cache.reset_stats()
@@ -959,25 +996,25 @@ class AsyncScraperManager:
             async with semaphore:
                 return await self._scrape_single(scraper)
 
-        # Run all scrapers concurrently
-        tasks = [scrape_with_limit(scraper) for scraper in self.scrapers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Process results
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Scraper task failed with exception: {result}")
-                continue
-            if isinstance(result, list):
-                all_articles.extend(result)
-
-        # Remove duplicates by URL
+        # Run all scrapers concurrently, removing duplicates by URL as results arrive
+        tasks = [asyncio.ensure_future(scrape_with_limit(scraper)) for scraper in self.scrapers]
         seen_urls: Set[str] = set()
-        unique_articles: List[ArticleData] = []
-        for article in all_articles:
-            if article.url not in seen_urls:
-                seen_urls.add(article.url)
-                unique_articles.append(article)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    articles = await next_done
+                except Exception as e:
+                    logger.error(f"Scraper task failed with exception: {e}")
+                    continue
+
+                for article in articles:
+                    if article.url not in seen_urls:
+                        seen_urls.add(article.url)
+                        yield article
+        finally:
+            # A consumer that stops early leaves no scrapers running
+            for task in tasks:
+                task.cancel()
 
         # Log statistics
         if self.http_cache:
@@ -1003,8 +1040,7 @@ class AsyncScraperManager:
                         },
                     )
 
-        logger.info("Scraping complete", extra={"unique_articles": len(unique_articles)})
-        return unique_articles
+        logger.info("Scraping complete", extra={"unique_articles": len(seen_urls)})
 
     async def _cleanup_http_cache(self) -> None:
         """Clean up old HTTP cache entries"""
@@ -8,7 +8,6 @@ Allows replaying pattern detection against historical data to:
 """
 
 import csv
-import json
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -19,6 +18,7 @@ from database import Database
 from pattern_detector import PatternDetector, PatternAlert
 from company_extractor import SentimentAnalyzer
 from logging_config import get_logger
+from json_codec import dumps_pretty
 
 logger = get_logger(__name__)
 
@@ -611,8 +611,7 @@ class Backtester:
 
         try:
             if format.lower() == "json":
-                with open(filepath, "w") as f:
-                    json.dump(self.report.to_dict(), f, indent=2)
+                filepath.write_text(dumps_pretty(self.report.to_dict()))
             elif format.lower() == "csv":
                 with open(filepath, "w", newline="") as f:
                     writer = csv.writer(f)
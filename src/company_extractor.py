@@ -68,11 +68,24 @@ class CompanyExtractor:
 
             self.patterns[ticker] = patterns
 
+        self._build_any_name_pattern()
+
         # Common ticker-only patterns (when mentioned with $ or as standalone)
         self.ticker_pattern = re.compile(
             r"\$([A-Z]{1,5})\b|\b([A-Z]{2,5})\s+(?:stock|shares|equity)", re.IGNORECASE
         )
 
+    def _build_any_name_pattern(self):
+        """Build one alternation over every watched name, used to skip texts quickly"""
+        names = [name for names in self.watchlist.values() for name in names]
+        self._any_name_pattern = (
+            re.compile(
+                r"\b(?:" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE
+            )
+            if names
+            else None
+        )
+
     def extract(self, text: str, context_window: int = 100) -> list[CompanyMatch]:
         """
         Extract company mentions from text
@@ -84,23 +97,23 @@ class CompanyExtractor:
         # Check each company in watchlist
         for ticker, patterns in self.patterns.items():
             for name, pattern in patterns:
-                for match in pattern.finditer(text):
-                    # Extract context around the match
-                    start = max(0, match.start() - context_window)
-                    end = min(len(text), match.end() + context_window)
-                    context = text[start:end]
+                match = pattern.search(text)
+                if match is None:
+                    continue
 
-                    # Calculate confidence based on match quality
-                    confidence = self._calculate_confidence(name, context)
+                # Extract context around the match
+                start = max(0, match.start() - context_window)
+                end = min(len(text), match.end() + context_window)
+                context = text[start:end]
 
-                    if ticker not in found_tickers:
-                        matches.append(
-                            CompanyMatch(
-                                ticker=ticker, name=name, confidence=confidence, context=context
-                            )
-                        )
-                        found_tickers.add(ticker)
-                    break  # Only count once per ticker
+                # Calculate confidence based on match quality
+                confidence = self._calculate_confidence(name, context)
+
+                matches.append(
+                    CompanyMatch(ticker=ticker, name=name, confidence=confidence, context=context)
+                )
+                found_tickers.add(ticker)
+                break  # Only count once per ticker; skip the remaining aliases
 
         # Also look for ticker symbols with $ prefix
         for match in self.ticker_pattern.finditer(text):
@@ -123,6 +136,30 @@ class CompanyExtractor:
 
         return matches
 
+    def extract_batch(
+        self, texts: list[str], context_window: int = 100
+    ) -> list[list[CompanyMatch]]:
+        """
+        Extract company mentions from many texts
+        Returns one list of CompanyMatch objects per text, in input order
+        """
+        any_name = self._any_name_pattern
+        ticker_pattern = self.ticker_pattern
+        extract = self.extract
+
+        results = []
+        for text in texts:
+            # A single combined scan rules out texts that mention no watched
+            # company before running every per-name pattern over them
+            if not text or (
+                (any_name is None or any_name.search(text) is None)
+                and ticker_pattern.search(text) is None
+            ):
+                results.append([])
+            else:
+                results.append(extract(text, context_window))
+        return results
+
     def _calculate_confidence(self, name: str, context: str) -> float:
         """Calculate confidence score for a match"""
         confidence = 0.5  # Base confidence
@@ -175,6 +212,7 @@ class CompanyExtractor:
                 patterns.append((name, re.compile(pattern, re.IGNORECASE)))
 
             self.patterns[ticker] = patterns
+            self._build_any_name_pattern()
             logger.info(f"Added company to watchlist: {ticker} - {names[0]}")
 
 
@@ -185,12 +223,14 @@ class KeywordSentimentAnalyzer:
         self.positive_words = [w.lower() for w in positive_words]
         self.negative_words = [w.lower() for w in negative_words]
 
-        # Compile patterns
+        # Compile patterns. Both the words and the analyzed text are lowercased,
+        # so the patterns match case-sensitively, which is much faster than
+        # re.IGNORECASE
         self.positive_pattern = re.compile(
-            r"\b(" + "|".join(re.escape(w) for w in self.positive_words) + r")\b", re.IGNORECASE
+            r"\b(" + "|".join(re.escape(w) for w in self.positive_words) + r")\b"
         )
         self.negative_pattern = re.compile(
-            r"\b(" + "|".join(re.escape(w) for w in self.negative_words) + r")\b", re.IGNORECASE
+            r"\b(" + "|".join(re.escape(w) for w in self.negative_words) + r")\b"
         )
 
         # Intensity modifiers
@@ -237,13 +277,20 @@ class KeywordSentimentAnalyzer:
         # Clamp to [-1, 1]
         return max(-1.0, min(1.0, score))
 
+    def analyze_many(self, texts: list[str]) -> list[float]:
+        """Score each text, returning one sentiment per input in order"""
+        analyze = self.analyze
+        return [analyze(t) for t in texts]
+
     def analyze_batch(self, texts: list[str]) -> dict[str, float]:
         """Analyze sentiment of multiple texts"""
+        # Score each text once rather than once per summary field
+        scores = self.analyze_many(texts)
         return {
-            "average": sum(self.analyze(t) for t in texts) / len(texts) if texts else 0,
-            "positive_count": sum(1 for t in texts if self.analyze(t) > 0.2),
-            "negative_count": sum(1 for t in texts if self.analyze(t) < -0.2),
-            "neutral_count": sum(1 for t in texts if -0.2 <= self.analyze(t) <= 0.2),
+            "average": sum(scores) / len(scores) if scores else 0,
+            "positive_count": sum(1 for s in scores if s > 0.2),
+            "negative_count": sum(1 for s in scores if s < -0.2),
+            "neutral_count": sum(1 for s in scores if -0.2 <= s <= 0.2),
         }
 
 
@@ -282,12 +329,17 @@ class MLSentimentAnalyzer:
         """
         return self._analyzer.polarity_scores(text)
 
+    def analyze_many(self, texts: list[str]) -> list[float]:
+        """Score each text, returning one compound score per input in order"""
+        polarity_scores = self._analyzer.polarity_scores
+        return [polarity_scores(t)["compound"] for t in texts]
+
     def analyze_batch(self, texts: list[str]) -> dict[str, float]:
         """Analyze sentiment of multiple texts"""
         if not texts:
             return {"average": 0, "positive_count": 0, "negative_count": 0, "neutral_count": 0}
 
-        scores = [self.analyze(t) for t in texts]
+        scores = self.analyze_many(texts)
         return {
             "average": sum(scores) / len(scores),
             "positive_count": sum(1 for s in scores if s > 0.05),
@@ -406,6 +458,16 @@ class SentimentAnalyzer:
             else:
                 return {"neg": 0, "neu": 1, "pos": 0, "compound": 0}
 
+    def analyze_many(self, texts: list[str]) -> list[float]:
+        """
+        Score a list of texts in one call
+        Returns one score per text, in input order, each between -1 and 1
+        """
+        if self._active_method == "ml":
+            return self._ml_analyzer.analyze_many(texts)
+        else:
+            return self._keyword_analyzer.analyze_many(texts)
+
     def analyze_batch(self, texts: list[str]) -> dict[str, float]:
         """Analyze sentiment of multiple texts"""
         if self._active_method == "ml":
@@ -12,6 +12,12 @@ from urllib.parse import urlparse
 
 import yaml
 
+# Chosen once at import: libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# URL schemes accepted for feeds and webhooks
+_URL_SCHEMES = frozenset({"http", "https"})
+
 
 @dataclass
 class ValidationError:
@@ -61,6 +67,8 @@ class ConfigValidator:
     def __init__(self, config_path: str = "config/settings.yaml"):
         self.config_path = Path(config_path)
         self.result = ValidationResult()
+        # Parsed configuration from the last validate() call
+        self.config: dict | None = None
 
     def validate(self) -> ValidationResult:
         """
@@ -70,6 +78,7 @@ class ConfigValidator:
             ValidationResult with any errors found.
         """
         self.result = ValidationResult()
+        self.config = None
 
         # Check file exists
         if not self.config_path.exists():
@@ -79,7 +88,7 @@ class ConfigValidator:
         # Load YAML
         try:
             with open(self.config_path) as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             self.result.add_error("", f"Invalid YAML syntax: {e}")
             return self.result
@@ -88,6 +97,8 @@ class ConfigValidator:
             self.result.add_error("", "Configuration file is empty")
             return self.result
 
+        self.config = config
+
         # Validate each section
         self._validate_scraping(config)
         self._validate_sources(config)
@@ -336,6 +347,22 @@ class ConfigValidator:
                                         kw,
                                     )
 
+        # Validate negative_cluster_keywords
+        cluster_keywords = patterns.get("negative_cluster_keywords")
+        if cluster_keywords is not None:
+            if not isinstance(cluster_keywords, list):
+                self.result.add_error(
+                    "patterns.negative_cluster_keywords", "must be a list", cluster_keywords
+                )
+            else:
+                for i, kw in enumerate(cluster_keywords):
+                    if not isinstance(kw, str) or not kw:
+                        self.result.add_error(
+                            f"patterns.negative_cluster_keywords[{i}]",
+                            "must be a non-empty string",
+                            kw,
+                        )
+
     def _validate_companies(self, config: dict) -> None:
         """Validate the companies section."""
         companies = config.get("companies")
@@ -530,7 +557,7 @@ class ConfigValidator:
         """Check if a string is a valid URL."""
         try:
             result = urlparse(url)
-            return all([result.scheme in ("http", "https"), result.netloc])
+            return result.scheme in _URL_SCHEMES and bool(result.netloc)
         except Exception:
             return False
 
@@ -570,12 +597,12 @@ def validate_config_or_exit(config_path: str = "config/settings.yaml") -> dict:
     Raises:
         SystemExit: If validation fails.
     """
-    result = validate_config(config_path)
+    validator = ConfigValidator(config_path)
+    result = validator.validate()
 
     if not result.is_valid:
         print(result, file=__import__("sys").stderr)
         raise SystemExit(1)
 
-    # Load and return the config
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    # Return the config parsed during validation rather than reading it again
+    return validator.config
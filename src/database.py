@@ -3,11 +3,14 @@ Database module for Nickberg Terminal
 Handles storage of articles, companies, and alerts
 """
 
+import os
 import sqlite3
 import json
+import threading
 import hashlib
 import html
 import re
+from collections import defaultdict
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -117,19 +120,62 @@ class Alert:
     acknowledged: bool = False
 
 
+# Per-connection tuning: fsync only at WAL checkpoints, keep temp tables in
+# memory, memory-map up to 256 MB of the file and allow a 64 MB page cache
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA cache_size=-65536;"
+)
+
+
 class Database:
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection per thread (sqlite3 connections aren't shareable)
+        self._local = threading.local()
+        self._enable_wal()
         self.init_db()
         self._run_migrations()
         self._create_indexes()
 
-    def get_connection(self) -> sqlite3.Connection:
+    def _enable_wal(self):
+        """Switch the database to write-ahead logging (persisted in the file)"""
         conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            logger.warning("Could not enable WAL journal mode", extra={"error": str(e)})
+        finally:
+            conn.close()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, opening it on first use.
+
+        The connection is reused for the life of the Database, so callers use it
+        as a context manager (commit on success, rollback on error) but should
+        not close it.
+        """
+        conn = getattr(self._local, "conn", None)
+        # A connection inherited across fork() must not be reused in the child
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
         return conn
 
+    def close(self):
+        """Close the calling thread's connection, if one is open"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Connection, None, None]:
         """
@@ -156,8 +202,6 @@ class Database:
             conn.rollback()
             logger.error("Transaction rolled back due to error", extra={"error": str(e)})
             raise DatabaseTransactionError(f"Transaction failed: {e}") from e
-        finally:
-            conn.close()
 
     def _run_migrations(self):
         """Run database migrations for schema updates"""
@@ -268,6 +312,15 @@ class Database:
                 )
             """)
 
+            # Market data cache (pickled payloads, so prices survive process restarts)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL,
+                    created_at REAL NOT NULL  -- Unix timestamp
+                )
+            """)
+
             # Indexes for performance (excluding content_hash which is created after migration)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
             conn.execute(
@@ -279,6 +332,17 @@ class Database:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_mentions_time ON company_mentions(mentioned_at)"
             )
+            # Per-company windowed counts seek on ticker, then range-scan on time
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mentions_ticker_time "
+                "ON company_mentions(company_ticker, mentioned_at)"
+            )
+            # Per-company article lookups seek on ticker and join on article_id
+            # straight from the index, without reading the mention rows
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mentions_ticker_article "
+                "ON company_mentions(company_ticker, article_id)"
+            )
             conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_time ON alerts(created_at)")
 
             conn.commit()
@@ -291,6 +355,18 @@ class Database:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles(content_hash)"
             )
+            # One mention per company per article; lets batch saves drop repeats
+            # in SQL with ON CONFLICT DO NOTHING
+            try:
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mentions_article_ticker "
+                    "ON company_mentions(article_id, company_ticker)"
+                )
+            except sqlite3.IntegrityError as e:
+                logger.warning(
+                    "Skipping unique mention index, existing rows have duplicates",
+                    extra={"error": str(e)},
+                )
             conn.commit()
 
     def save_article(self, article: Article) -> int | None:
@@ -606,6 +682,102 @@ class Database:
             logger.error("Error in batch mention save", extra={"error": str(e)})
             return 0
 
+    def save_articles_with_mentions_batch(
+        self, items: list[tuple[Article, list[tuple[str, str, str]]]]
+    ) -> list[int | None]:
+        """
+        Save many articles and their company mentions in a single transaction.
+
+        Articles are inserted one at a time so each gets its ID (and so content
+        hash duplicates within the batch are caught), then every mention is
+        written with one executemany. Mentions are passed as plain
+        (ticker, name, context) rows rather than CompanyMention objects, since
+        their article ID is only known here.
+
+        Args:
+            items: (article, mention rows) pairs
+
+        Returns:
+            The article ID for each item, or None where the article was a duplicate
+        """
+        if not items:
+            return []
+
+        article_ids: list[int | None] = []
+        mention_rows = []
+
+        try:
+            with self.transaction() as conn:
+                for article, mentions in items:
+                    content_hash = article.content_hash
+                    if not content_hash:
+                        content_hash = Article.compute_content_hash(
+                            article.title, article.content or ""
+                        )
+
+                    existing = conn.execute(
+                        "SELECT id FROM articles WHERE content_hash = ?", (content_hash,)
+                    ).fetchone()
+                    if existing:
+                        article_ids.append(None)
+                        continue
+
+                    cursor = conn.execute(
+                        """
+                        INSERT OR IGNORE INTO articles
+                        (url, title, content, source, published_at, sentiment_score, mentions, content_hash)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            article.url,
+                            sanitize_html(article.title) if article.title else article.title,
+                            sanitize_html(article.content) if article.content else article.content,
+                            article.source,
+                            article.published_at,
+                            article.sentiment_score,
+                            article.mentions,
+                            content_hash,
+                        ),
+                    )
+
+                    # lastrowid is sticky on a shared connection, so use rowcount
+                    # to tell an ignored (duplicate URL) insert apart
+                    if cursor.rowcount != 1:
+                        article_ids.append(None)
+                        continue
+
+                    article_id = cursor.lastrowid
+                    article_ids.append(article_id)
+                    mention_rows.extend(
+                        (ticker, name, article_id, sanitize_html(context) if context else context)
+                        for ticker, name, context in mentions
+                    )
+
+                if mention_rows:
+                    conn.executemany(
+                        """
+                        INSERT INTO company_mentions
+                        (company_ticker, company_name, article_id, context)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT DO NOTHING
+                        """,
+                        mention_rows,
+                    )
+
+            logger.debug(
+                "Batch saved articles with mentions",
+                extra={
+                    "total": len(items),
+                    "inserted": sum(1 for i in article_ids if i),
+                    "mentions": len(mention_rows),
+                },
+            )
+            return article_ids
+
+        except DatabaseTransactionError:
+            # Already logged in transaction() context manager
+            return [None] * len(items)
+
     def save_alerts_batch(self, alerts: list[Alert]) -> list[int]:
         """
         Save multiple alerts in a single transaction, respecting duplicate suppression.
@@ -768,6 +940,153 @@ class Database:
 
             return row["count"] if row else 0
 
+    def get_article_counts_by_company(
+        self,
+        hours: tuple[int, ...],
+        tickers: list[str] | None = None,
+        now: datetime | None = None,
+    ) -> dict[str, list[int]]:
+        """
+        Get counts of articles mentioning each company over several time windows
+
+        Same counts as get_article_count_for_company, for every window and every
+        company in one grouped query.
+
+        Args:
+            hours: Window lengths in hours
+            tickers: Companies to count (defaults to all with mentions in the
+                longest window)
+            now: End of every window (defaults to the current time)
+
+        Returns:
+            Counts per window, in the order of ``hours``, by ticker. Companies
+            without mentions in any window are left out.
+        """
+        if not hours:
+            return {}
+
+        now = now or datetime.now()
+        cutoffs = [now - timedelta(hours=h) for h in hours]
+        # FILTER keeps rows outside a window out of that window's DISTINCT set
+        windows = ", ".join(
+            f"COUNT(DISTINCT article_id) FILTER (WHERE mentioned_at > ?) AS c{i}"
+            for i in range(len(hours))
+        )
+        params: list[Any] = [*cutoffs, min(cutoffs)]
+        ticker_filter = ""
+        if tickers is not None:
+            if not tickers:
+                return {}
+            ticker_filter = f"AND company_ticker IN ({', '.join('?' * len(tickers))})"
+            params.extend(tickers)
+
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT company_ticker, {windows}
+                FROM company_mentions
+                WHERE mentioned_at > ?
+                {ticker_filter}
+                GROUP BY company_ticker
+                """,
+                params,
+            ).fetchall()
+
+        return {row[0]: list(row[1:]) for row in rows}
+
+    def get_daily_counts(
+        self, days: int = 7, tickers: list[str] | None = None, now: datetime | None = None
+    ) -> dict[str, list[int]]:
+        """
+        Get per-day counts of articles mentioning each company
+
+        Day 0 is the last 24 hours, day 1 the 24 hours before that, and so on:
+        the counts differencing get_article_count_for_company over successive
+        whole-day windows gives, for every company in one grouped query.
+
+        Args:
+            days: Number of days to count
+            tickers: Companies to count (defaults to all with mentions in the window)
+            now: End of day 0 (defaults to the current time)
+
+        Returns:
+            Counts per day, newest first, by ticker. Companies without mentions
+            in the window are left out.
+        """
+        now = now or datetime.now()
+        params: list[Any] = [now, now - timedelta(days=days)]
+        ticker_filter = ""
+        if tickers is not None:
+            if not tickers:
+                return {}
+            ticker_filter = f"AND company_ticker IN ({', '.join('?' * len(tickers))})"
+            params.extend(tickers)
+
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT company_ticker,
+                       CAST(julianday(?) - julianday(mentioned_at) AS INTEGER) AS day_ago,
+                       COUNT(DISTINCT article_id) AS count
+                FROM company_mentions
+                WHERE mentioned_at > ?
+                {ticker_filter}
+                GROUP BY company_ticker, day_ago
+                """,
+                params,
+            ).fetchall()
+
+        counts: dict[str, list[int]] = {}
+        for ticker, day_ago, count in rows:
+            # Mentions timestamped ahead of now count towards today
+            counts.setdefault(ticker, [0] * days)[max(day_ago, 0)] += count
+        return counts
+
+    def get_articles_for_companies(
+        self, tickers: list[str], since: datetime, columns: tuple[str, ...] | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get articles mentioning each of several companies since a given time
+
+        One query for every company, in place of one per company and window;
+        callers narrow each company's list to the windows they need.
+
+        Args:
+            tickers: Companies to fetch articles for
+            since: Earliest publication time to include
+            columns: Article columns to return (defaults to all)
+
+        Returns:
+            Article rows as dicts, newest first, by ticker. Companies without
+            articles in the window are left out.
+        """
+        if not tickers:
+            return {}
+
+        selected = ", ".join(f"a.{column}" for column in columns) if columns else "a.*"
+        with self.get_connection() as conn:
+            # Plain tuples; each row becomes a dict below, so skip building sqlite3.Row
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"""
+                SELECT cm.company_ticker, {selected}
+                FROM articles a
+                JOIN company_mentions cm ON a.id = cm.article_id
+                WHERE cm.company_ticker IN ({", ".join("?" * len(tickers))})
+                AND a.published_at >= ?
+                ORDER BY a.published_at DESC
+                """,
+                [*tickers, since.isoformat(" ")],
+            )
+            names = [description[0] for description in cursor.description[1:]]
+            rows = cursor.fetchall()
+
+        articles: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for ticker, *values in rows:
+            articles[ticker].append(dict(zip(names, values)))
+        return dict(articles)
+
     def get_recent_articles(self, limit: int = 50, source: str | None = None) -> list[Article]:
         """Get recent articles"""
         with self.get_connection() as conn:
@@ -840,6 +1159,9 @@ class Database:
             )
             deleted_alerts = cursor.rowcount
 
+            # Drop cached market data from before the retention window
+            conn.execute("DELETE FROM price_cache WHERE created_at < ?", (cutoff.timestamp(),))
+
             conn.commit()
             logger.info(
                 "Cleaned up old data",
@@ -970,3 +1292,46 @@ class Database:
         except sqlite3.Error as e:
             logger.error("Error deleting preference", extra={"key": key, "error": str(e)})
             return False
+
+    def get_price_cache_entry(self, key: str) -> tuple[bytes, float] | None:
+        """
+        Get a cached market data entry.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            (payload, created_at) tuple, or None if the key isn't cached
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM price_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                return (row["payload"], row["created_at"]) if row else None
+        except sqlite3.Error as e:
+            logger.error("Error reading price cache", extra={"key": key, "error": str(e)})
+            return None
+
+    def set_price_cache_entry(self, key: str, payload: bytes, created_at: float) -> bool:
+        """
+        Store a cached market data entry, replacing any existing one.
+
+        Args:
+            key: The cache key
+            payload: Serialized cache value
+            created_at: Unix timestamp the value was fetched at
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO price_cache (cache_key, payload, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, payload, created_at),
+                )
+            return True
+        except DatabaseTransactionError:
+            return False
@@ -0,0 +1,58 @@
+"""
+JSON encoding with orjson when it's installed, falling back to the stdlib json.
+
+orjson is several times faster than the stdlib encoder for the short ticker
+lists serialized per article, the config snapshot and the backtest report.
+The fallback behaves the same way where it matters: dumps rejects non-string
+dict keys, and dumps_pretty accepts them.
+"""
+
+import json
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional speedup
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+
+    def dumps(obj) -> str:
+        """Encode as single-line JSON"""
+        return orjson.dumps(obj).decode()
+
+    loads = orjson.loads
+
+    def dumps_pretty(obj) -> str:
+        """Encode as indented JSON, allowing non-string keys and numpy values"""
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+else:  # pragma: no cover - optional speedup
+
+    def _check_str_keys(obj) -> None:
+        """Raise TypeError on non-string dict keys, as orjson does"""
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                if not isinstance(key, str):
+                    raise TypeError(f"Dict key must be str, not {type(key).__name__}")
+                _check_str_keys(value)
+        elif isinstance(obj, list | tuple):
+            for value in obj:
+                _check_str_keys(value)
+
+    def dumps(obj) -> str:
+        """Encode as single-line JSON"""
+        # json would turn the keys into strings, so decoding the result would
+        # no longer give back what was encoded
+        _check_str_keys(obj)
+        return json.dumps(obj)
+
+    loads = json.loads
+
+    def dumps_pretty(obj) -> str:
+        """Encode as indented JSON, allowing non-string keys"""
+        return json.dumps(obj, indent=2)
@@ -16,6 +16,36 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 
+# LogRecord attributes that are not user-supplied context. Built once at import
+# rather than per record in each formatter.
+_STANDARD_LOGRECORD_ATTRS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "created",
+        "filename",
+        "funcName",
+        "levelname",
+        "levelno",
+        "lineno",
+        "module",
+        "msecs",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "stack_info",
+        "exc_info",
+        "exc_text",
+        "thread",
+        "threadName",
+        "taskName",
+        "message",
+    }
+)
+
+
 class JSONFormatter(logging.Formatter):
     """
     Custom JSON formatter for structured logging.
@@ -40,40 +70,20 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        # Add extra context fields (skip standard LogRecord attributes)
-        standard_attrs = {
-            "name",
-            "msg",
-            "args",
-            "created",
-            "filename",
-            "funcName",
-            "levelname",
-            "levelno",
-            "lineno",
-            "module",
-            "msecs",
-            "pathname",
-            "process",
-            "processName",
-            "relativeCreated",
-            "stack_info",
-            "exc_info",
-            "exc_text",
-            "thread",
-            "threadName",
-            "taskName",
-            "message",
-        }
-
-        for key, value in record.__dict__.items():
-            if key not in standard_attrs and not key.startswith("_"):
-                # Handle non-serializable objects
-                try:
-                    json.dumps(value)
-                    log_data[key] = value
-                except (TypeError, ValueError):
-                    log_data[key] = str(value)
+        # Add extra context fields (skip standard LogRecord attributes). The set
+        # difference runs in C; walking the record dict is only needed to keep the
+        # caller's field order when there are extras at all.
+        attrs = record.__dict__
+        extras = attrs.keys() - _STANDARD_LOGRECORD_ATTRS
+        if extras:
+            for key, value in attrs.items():
+                if key in extras and not key.startswith("_"):
+                    # Handle non-serializable objects
+                    try:
+                        json.dumps(value)
+                        log_data[key] = value
+                    except (TypeError, ValueError):
+                        log_data[key] = str(value)
 
         return json.dumps(log_data)
 
@@ -91,38 +101,16 @@ class TextFormatter(logging.Formatter):
         base_msg = f"{timestamp} - {record.name} - {record.levelname} - {record.getMessage()}"
 
         # Collect extra context fields
-        standard_attrs = {
-            "name",
-            "msg",
-            "args",
-            "created",
-            "filename",
-            "funcName",
-            "levelname",
-            "levelno",
-            "lineno",
-            "module",
-            "msecs",
-            "pathname",
-            "process",
-            "processName",
-            "relativeCreated",
-            "stack_info",
-            "exc_info",
-            "exc_text",
-            "thread",
-            "threadName",
-            "taskName",
-            "message",
-        }
-
-        extra_parts = []
-        for key, value in record.__dict__.items():
-            if key not in standard_attrs and not key.startswith("_"):
-                extra_parts.append(f"{key}={value}")
-
-        if extra_parts:
-            base_msg += f" [{', '.join(extra_parts)}]"
+        attrs = record.__dict__
+        extras = attrs.keys() - _STANDARD_LOGRECORD_ATTRS
+        if extras:
+            extra_parts = [
+                f"{key}={value}"
+                for key, value in attrs.items()
+                if key in extras and not key.startswith("_")
+            ]
+            if extra_parts:
+                base_msg += f" [{', '.join(extra_parts)}]"
 
         # Add exception info if present
         if record.exc_info:
@@ -149,6 +137,12 @@ def get_log_format() -> str:
     return os.environ.get("LOG_FORMAT", "text").lower()
 
 
+# Signature of the last setup_logging() call and the handlers it installed,
+# used to skip rebuilding an identical handler stack
+_SETUP_SIG: tuple | None = None
+_SETUP_HANDLERS: tuple[logging.Handler, ...] = ()
+
+
 def setup_logging(
     log_dir: str = "logs",
     verbose: bool = False,
@@ -164,7 +158,7 @@ def setup_logging(
         log_format: 'json' or 'text' (overrides LOG_FORMAT env var)
         log_level: Logging level (overrides LOG_LEVEL env var and verbose flag)
     """
-    Path(log_dir).mkdir(exist_ok=True)
+    global _SETUP_SIG, _SETUP_HANDLERS
 
     # Determine log level
     if log_level is not None:
@@ -177,6 +171,14 @@ def setup_logging(
     # Determine log format
     fmt = log_format if log_format is not None else get_log_format()
 
+    # Already configured this way, and our handlers are still attached
+    root_logger = logging.getLogger()
+    sig = (level, fmt, log_dir)
+    if sig == _SETUP_SIG and all(h in root_logger.handlers for h in _SETUP_HANDLERS):
+        return
+
+    Path(log_dir).mkdir(exist_ok=True)
+
     # Create formatter based on format type
     if fmt == "json":
         formatter = JSONFormatter()
@@ -184,7 +186,6 @@ def setup_logging(
         formatter = TextFormatter()
 
     # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
     # Remove existing handlers
@@ -203,6 +204,9 @@ def setup_logging(
     file_handler.setFormatter(formatter)
     root_logger.addHandler(file_handler)
 
+    _SETUP_SIG = sig
+    _SETUP_HANDLERS = (console_handler, file_handler)
+
     # Reduce noise from external libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
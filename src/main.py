@@ -4,41 +4,122 @@ Nickberg Terminal - Main runner
 
 import os
 import sys
-import json
-import yaml
+import time
 import logging
 import argparse
-from datetime import datetime
+import asyncio
+from datetime import date, datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database import Database, Article, CompanyMention
-from scraper import ScraperManager
-from company_extractor import CompanyExtractor
-from pattern_detector import PatternDetector
-from alerts import AlertManager
+from database import Database, Article
 from logging_config import setup_logging, get_logger
-from config_validator import validate_config
-from backtester import Backtester
+from json_codec import dumps, dumps_pretty, loads
+
+# The scraper, extractor, detector and alert modules pull in requests, pandas,
+# scikit-learn and friends. They are imported where first used so commands like
+# `status` and `reset-alerts` don't pay for them at startup.
+if TYPE_CHECKING:
+    from scraper import ArticleData, ScraperManager
+    from company_extractor import CompanyExtractor
+    from pattern_detector import PatternDetector
+    from alerts import AlertManager
+
+# Parsed config snapshots by path: (YAML st_mtime_ns, config encoded as JSON)
+_config_snapshots: dict[str, tuple[int, bytes]] = {}
+
+# Scraped articles are processed and saved in chunks of this many
+PROCESS_CHUNK_SIZE = 500
+
+# Database threshold preference -> (config section, config key)
+_THRESHOLD_MAP = {
+    "volume_spike": ("patterns", "volume_spike_threshold"),
+    "min_articles": ("patterns", "min_articles_for_alert"),
+    "sentiment_shift": ("patterns", "sentiment_shift_threshold"),
+}
+
+# Database alert channel preference -> key of its on/off flag inside the
+# channel's alerts section, or None when the channel entry is the flag itself
+_CHANNEL_MAP = {
+    "telegram": "enabled",
+    "webhook": "enabled",
+    "file": "enabled",
+    "console": None,
+}
 
 # Path to last scrape timestamp file
 LAST_SCRAPE_FILE = Path(__file__).parent.parent / "data" / "last_scrape.json"
+_LAST_SCRAPE_TMP = LAST_SCRAPE_FILE.with_suffix(".tmp")
+# Whole record as a strftime template (braces pass through untouched)
+_LAST_SCRAPE_TEMPLATE = '{"last_scrape": "%Y-%m-%dT%H:%M:%SZ"}'
+_TMP_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+# Set once the data directory is known to exist, so later cycles skip the mkdir
+_last_scrape_dir_ready = False
 
 
 def record_last_scrape_time():
     """Record the timestamp of a successful scrape to a file"""
+    global _last_scrape_dir_ready
     try:
-        LAST_SCRAPE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        data = {"last_scrape": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")}
-        with open(LAST_SCRAPE_FILE, "w") as f:
-            json.dump(data, f)
+        if not _last_scrape_dir_ready:
+            LAST_SCRAPE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _last_scrape_dir_ready = True
+        # Fixed one-key record, so format it directly instead of going through json
+        payload = time.strftime(_LAST_SCRAPE_TEMPLATE, time.gmtime()).encode()
+        # Write to a temp file and rename so readers never see a partial file
+        fd = os.open(_LAST_SCRAPE_TMP, _TMP_OPEN_FLAGS, 0o644)
+        try:
+            written = os.write(fd, payload)
+        finally:
+            os.close(fd)
+        if written != len(payload):
+            raise OSError(f"short write ({written} of {len(payload)} bytes)")
+        os.replace(_LAST_SCRAPE_TMP, LAST_SCRAPE_FILE)
     except OSError as e:
+        _last_scrape_dir_ready = False
+        # Don't leave a stale or truncated temp file behind
+        try:
+            os.unlink(_LAST_SCRAPE_TMP)
+        except OSError:
+            pass
         get_logger(__name__).warning("Failed to record last scrape time", extra={"error": str(e)})
 
 
+def compiled_config_path(config_path: str) -> Path:
+    """Path of the precompiled JSON config for a YAML config file"""
+    return Path(config_path).with_suffix(".compiled.json")
+
+
+def write_compiled_config(config_path: str, config: dict) -> bool:
+    """
+    Write a validated config as JSON next to its YAML file
+
+    The JSON follows a header line holding the YAML's st_mtime_ns, and later
+    startups load it instead of parsing the YAML only while that still matches
+    exactly. Returns False if the config holds values JSON can't represent or
+    the file couldn't be written.
+    """
+    compiled_path = compiled_config_path(config_path)
+    tmp_path = compiled_path.with_suffix(".tmp")
+    try:
+        body = dumps(config).encode()
+        mtime_ns = os.stat(config_path).st_mtime_ns
+        tmp_path.write_bytes(b"%d\n" % mtime_ns + body)
+        os.replace(tmp_path, compiled_path)
+    except (TypeError, OSError) as e:
+        get_logger(__name__).warning(
+            "Failed to write compiled config",
+            extra={"config_path": config_path, "error": str(e)},
+        )
+        return False
+    return True
+
+
 class NickbergTerminal:
     """Main bot class"""
 
@@ -52,17 +133,75 @@ class NickbergTerminal:
         # Merge database preferences with config file (database overrides config)
         self._merge_database_preferences()
 
-        self.scraper_manager = ScraperManager(config_path)
-        self.company_extractor = CompanyExtractor(self.config["companies"]["watchlist"])
-        self.pattern_detector = PatternDetector(self.db, self.config["patterns"])
-        self.alert_manager = AlertManager(self.config["alerts"], self.db)
-
         self.logger = get_logger(__name__)
 
+    @cached_property
+    def scraper_manager(self) -> "ScraperManager":
+        from scraper import ScraperManager
+
+        return ScraperManager(self.config_path)
+
+    @cached_property
+    def company_extractor(self) -> "CompanyExtractor":
+        from company_extractor import CompanyExtractor
+
+        return CompanyExtractor(self.config["companies"]["watchlist"])
+
+    @cached_property
+    def pattern_detector(self) -> "PatternDetector":
+        from pattern_detector import PatternDetector
+
+        return PatternDetector(self.db, self.config["patterns"])
+
+    @cached_property
+    def alert_manager(self) -> "AlertManager":
+        from alerts import AlertManager
+
+        return AlertManager(self.config["alerts"], self.db)
+
     def _load_config(self) -> dict:
-        """Load configuration from YAML"""
+        """
+        Load configuration from YAML
+
+        A compiled JSON config written by the `validate` command is used instead
+        while the YAML's st_mtime_ns matches the one it was compiled from.
+        Otherwise the YAML is parsed, and the result kept in-process as a JSON
+        snapshot tagged with the YAML's st_mtime_ns, reused for as long as the
+        YAML is unchanged.
+        """
+        mtime_ns = os.stat(self.config_path).st_mtime_ns
+
+        # Each load decodes its own copy, since preferences are merged into it
+        memo = _config_snapshots.get(self.config_path)
+        if memo is not None and memo[0] == mtime_ns:
+            return loads(memo[1])
+
+        # A compiled config written by `validate` wins while it was built from
+        # this exact YAML; comparing file ages would trust it over an older YAML
+        # restored with its original mtime
+        compiled_path = compiled_config_path(self.config_path)
+        try:
+            header, _, body = compiled_path.read_bytes().partition(b"\n")
+            if int(header) == mtime_ns:
+                config = loads(body)
+                _config_snapshots[self.config_path] = (mtime_ns, body)
+                return config
+        except (OSError, ValueError):
+            pass  # Not compiled yet, or unreadable; parse the YAML
+
+        import yaml
+
+        # Use libyaml's C parser when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(self.config_path) as f:
-            return yaml.safe_load(f)
+            config = yaml.load(f, Loader=loader)
+
+        try:
+            body = dumps(config).encode()
+        except TypeError:
+            return config  # Non-JSON values (e.g. dates); always parse the YAML
+        _config_snapshots[self.config_path] = (mtime_ns, body)
+        return config
 
     def _merge_database_preferences(self):
         """
@@ -86,36 +225,21 @@ class NickbergTerminal:
             # Merge thresholds into patterns config
             db_thresholds = db_prefs.get("thresholds")
             if db_thresholds and isinstance(db_thresholds, dict):
-                if "volume_spike" in db_thresholds:
-                    self.config["patterns"]["volume_spike_threshold"] = db_thresholds[
-                        "volume_spike"
-                    ]
-                if "min_articles" in db_thresholds:
-                    self.config["patterns"]["min_articles_for_alert"] = db_thresholds[
-                        "min_articles"
-                    ]
-                if "sentiment_shift" in db_thresholds:
-                    self.config["patterns"]["sentiment_shift_threshold"] = db_thresholds[
-                        "sentiment_shift"
-                    ]
+                for src_key, (section, key) in _THRESHOLD_MAP.items():
+                    if src_key in db_thresholds:
+                        self.config[section][key] = db_thresholds[src_key]
 
             # Merge alert channel settings
             db_channels = db_prefs.get("alert_channels")
             if db_channels and isinstance(db_channels, dict):
-                if "telegram" in db_channels:
-                    if "telegram" not in self.config["alerts"]:
-                        self.config["alerts"]["telegram"] = {}
-                    self.config["alerts"]["telegram"]["enabled"] = db_channels["telegram"]
-                if "webhook" in db_channels:
-                    if "webhook" not in self.config["alerts"]:
-                        self.config["alerts"]["webhook"] = {}
-                    self.config["alerts"]["webhook"]["enabled"] = db_channels["webhook"]
-                if "file" in db_channels:
-                    if "file" not in self.config["alerts"]:
-                        self.config["alerts"]["file"] = {}
-                    self.config["alerts"]["file"]["enabled"] = db_channels["file"]
-                if "console" in db_channels:
-                    self.config["alerts"]["console"] = db_channels["console"]
+                alerts_config = self.config["alerts"]
+                for channel, flag in _CHANNEL_MAP.items():
+                    if channel not in db_channels:
+                        continue
+                    if flag is None:
+                        alerts_config[channel] = db_channels[channel]
+                    else:
+                        alerts_config.setdefault(channel, {})[flag] = db_channels[channel]
 
             # Store severity routing and company preferences in config for alert manager
             db_routing = db_prefs.get("severity_routing")
@@ -135,77 +259,24 @@ class NickbergTerminal:
         """Run one cycle of the bot"""
         self.logger.info("Starting Nickberg Terminal cycle", extra={"dry_run": dry_run})
 
-        # Step 1: Scrape articles
+        # Steps 1-2: Scrape all sources concurrently on one event loop, processing
+        # the articles in fixed-size chunks as sources finish
         self.logger.info("Scraping articles", extra={"step": 1})
-        articles = self.scraper_manager.scrape_all()
+        total_articles, new_articles, mentions_count = asyncio.run(
+            self._scrape_and_process(dry_run)
+        )
 
-        if not articles:
+        if not total_articles:
             self.logger.warning("No articles found")
             return
 
-        # Step 2: Process articles
-        self.logger.info("Processing articles", extra={"step": 2, "total_articles": len(articles)})
-        new_articles = 0
-        mentions_count = 0
-
-        for article_data in articles:
-            # Extract companies
-            matches = self.company_extractor.extract(article_data.content)
-
-            if not matches:
-                continue
-
-            # Analyze sentiment
-            sentiment_score = None
-            if article_data.content:
-                sentiment_score = self.pattern_detector.sentiment_analyzer.analyze(
-                    article_data.content
-                )
-
-            # Prepare mentions JSON
-            mentions = json.dumps([m.ticker for m in matches])
-
-            # Create article object
-            article = Article(
-                id=None,
-                url=article_data.url,
-                title=article_data.title,
-                content=article_data.content,
-                source=article_data.source,
-                published_at=article_data.published_at,
-                scraped_at=datetime.now(),
-                sentiment_score=sentiment_score,
-                mentions=mentions,
-            )
-
-            # Save article
-            if not dry_run:
-                article_id = self.db.save_article(article)
-            else:
-                article_id = 1  # Fake ID for dry run
-
-            if article_id:
-                new_articles += 1
-
-                # Save company mentions
-                for match in matches:
-                    mention = CompanyMention(
-                        id=None,
-                        company_ticker=match.ticker,
-                        company_name=match.name,
-                        article_id=article_id,
-                        mentioned_at=article_data.published_at or datetime.now(),
-                        context=match.context[:500],  # Limit context size
-                    )
-
-                    if not dry_run:
-                        if self.db.save_company_mention(mention):
-                            mentions_count += 1
-                    else:
-                        mentions_count += 1
-
         self.logger.info(
-            "Articles processed", extra={"new_articles": new_articles, "mentions": mentions_count}
+            "Articles processed",
+            extra={
+                "total_articles": total_articles,
+                "new_articles": new_articles,
+                "mentions": mentions_count,
+            },
         )
 
         # Step 3: Detect patterns
@@ -250,6 +321,108 @@ class NickbergTerminal:
             record_last_scrape_time()
             self.logger.info("Recorded last scrape timestamp")
 
+    async def _scrape_and_process(self, dry_run: bool) -> tuple[int, int, int]:
+        """
+        Scrape all sources, processing articles in chunks of PROCESS_CHUNK_SIZE
+        as they arrive
+
+        Only one chunk is held at a time. Each chunk is processed on a worker
+        thread, so the remaining sources keep downloading meanwhile.
+
+        Returns:
+            Articles scraped, articles newly saved, and company mentions found
+        """
+        total_articles = new_articles = mentions_count = 0
+        chunk: list[ArticleData] = []
+
+        async def process() -> None:
+            nonlocal total_articles, new_articles, mentions_count
+            self.logger.info("Processing articles", extra={"step": 2, "chunk_size": len(chunk)})
+            total_articles += len(chunk)
+            saved, mentioned = await asyncio.to_thread(self._process_articles, chunk, dry_run)
+            new_articles += saved
+            mentions_count += mentioned
+
+        async for article in self.scraper_manager.scrape_all_async_iter():
+            chunk.append(article)
+            if len(chunk) == PROCESS_CHUNK_SIZE:
+                await process()
+                chunk = []
+        if chunk:
+            await process()
+
+        return total_articles, new_articles, mentions_count
+
+    def _process_articles(self, articles: list["ArticleData"], dry_run: bool) -> tuple[int, int]:
+        """
+        Extract companies and sentiment for a chunk of scraped articles and save
+        them in one transaction
+
+        Returns:
+            (new articles saved, company mentions saved)
+        """
+        new_articles = 0
+        mentions_count = 0
+
+        # Extract companies for every article in one pass, keeping only articles
+        # that mention one
+        matches_list = self.company_extractor.extract_batch([a.content for a in articles])
+        matched = [(a, matches) for a, matches in zip(articles, matches_list) if matches]
+
+        if dry_run:
+            # Nothing is saved, so skip sentiment and building articles and mention rows
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for article_data, matches in matched:
+                    self.logger.debug(
+                        "DRY RUN - Would save article",
+                        extra={"url": article_data.url, "tickers": [m.ticker for m in matches]},
+                    )
+            return len(matched), sum(len(matches) for _, matches in matched)
+
+        # Analyze sentiment for every matched article in a single call
+        scores = iter(
+            self.pattern_detector.sentiment_analyzer.analyze_many(
+                [a.content for a, _ in matched if a.content]
+            )
+        )
+
+        # Build every article and its mentions, then persist them in one transaction
+        pending: list[tuple[Article, list[tuple[str, str, str]]]] = []
+        for article_data, matches in matched:
+            sentiment_score = next(scores) if article_data.content else None
+
+            # Prepare mentions JSON
+            mentions = dumps([m.ticker for m in matches])
+
+            # Create article object
+            article = Article(
+                id=None,
+                url=article_data.url,
+                title=article_data.title,
+                content=article_data.content,
+                source=article_data.source,
+                published_at=article_data.published_at,
+                scraped_at=datetime.now(),
+                sentiment_score=sentiment_score,
+                mentions=mentions,
+            )
+
+            # Mentions go to the database as flat (ticker, name, context) rows,
+            # with context capped at 500 characters
+            mention_rows = [(m.ticker, m.name, m.context[:500]) for m in matches]
+
+            pending.append((article, mention_rows))
+
+        # Save articles and mentions
+        article_ids = self.db.save_articles_with_mentions_batch(pending)
+
+        for (_, mention_rows), article_id in zip(pending, article_ids):
+            if article_id:
+                new_articles += 1
+                mentions_count += len(mention_rows)
+
+        return new_articles, mentions_count
+
     def show_status(self):
         """Show current bot status"""
         stats = self.db.get_stats()
@@ -290,8 +463,6 @@ class NickbergTerminal:
     def reset_alerts(self):
         """Clear all alerts (use with caution)"""
         print("This will clear all alerts. Press Ctrl+C to cancel...")
-        import time
-
         time.sleep(3)
 
         with self.db.get_connection() as conn:
@@ -302,12 +473,16 @@ class NickbergTerminal:
 
 def run_backtest(args, bot: NickbergTerminal):
     """Run backtesting with the provided arguments."""
+    from backtester import Backtester
+
     logger = get_logger(__name__)
 
     # Parse dates
     try:
-        start_date = datetime.strptime(args.start, "%Y-%m-%d")
-        end_date = datetime.strptime(args.end, "%Y-%m-%d")
+        # date, not datetime: fromisoformat would also take times, which the
+        # YYYY-MM-DD options don't promise
+        start_date = datetime.combine(date.fromisoformat(args.start), datetime.min.time())
+        end_date = datetime.combine(date.fromisoformat(args.end), datetime.min.time())
     except ValueError as e:
         print(f"Error: Invalid date format. Use YYYY-MM-DD. ({e})")
         sys.exit(1)
@@ -349,7 +524,7 @@ def run_backtest(args, bot: NickbergTerminal):
     else:
         # Print JSON to stdout if no output file
         print("\nFull report (JSON):")
-        print(json.dumps(backtester.generate_report(), indent=2))
+        print(dumps_pretty(backtester.generate_report()))
 
 
 def main():
@@ -428,11 +603,16 @@ def main():
     bot_dir = Path(__file__).parent.parent
     os.chdir(bot_dir)
 
+    from config_validator import ConfigValidator, validate_config
+
     # Handle validate command separately (before creating bot)
     if args.command == "validate":
-        result = validate_config(args.config)
+        validator = ConfigValidator(args.config)
+        result = validator.validate()
         if result.is_valid:
             print(f"Configuration file '{args.config}' is valid.")
+            if write_compiled_config(args.config, validator.config):
+                print(f"Compiled config written to '{compiled_config_path(args.config)}'.")
             sys.exit(0)
         else:
             print(result, file=sys.stderr)
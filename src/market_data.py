@@ -4,12 +4,20 @@ Market data provider for fetching stock prices and calculating price changes.
 Uses yfinance library to get stock data. Includes caching to minimize API calls.
 """
 
+import heapq
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from dataclasses import dataclass
 
 from logging_config import get_logger
+from json_codec import dumps, loads
+
+if TYPE_CHECKING:
+    from database import Database
 
 logger = get_logger(__name__)
 
@@ -23,6 +31,13 @@ except ImportError:
     logger.warning("yfinance not installed. Market data features will be disabled.")
 
 
+def _pct_change(start: float, end: float) -> float | None:
+    """Percentage change from start to end rounded to 2 places, or None if start isn't positive"""
+    if not start > 0:
+        return None
+    return round(float((end - start) / start * 100), 2)
+
+
 @dataclass
 class PriceData:
     """Container for price data."""
@@ -51,7 +66,11 @@ class MarketDataProvider:
     core functionality.
     """
 
-    def __init__(self, config: dict[str, Any] | None = None):
+    # Shared across providers for concurrent yfinance lookups; threads are only
+    # started on first use
+    _pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-data")
+
+    def __init__(self, config: dict[str, Any] | None = None, db: "Database | None" = None):
         """
         Initialize the market data provider.
 
@@ -59,42 +78,95 @@ class MarketDataProvider:
             config: Optional configuration dict with keys:
                 - enabled: bool (default True)
                 - cache_ttl_minutes: int (default 15)
+                - cache_max_entries: int (default 2048)
+            db: Optional Database used to persist the cache across restarts
         """
         self.config = config or {}
         self.enabled = self.config.get("enabled", True) and YFINANCE_AVAILABLE
         self.cache_ttl_seconds = self.config.get("cache_ttl_minutes", 15) * 60
+        self.cache_max_entries = self.config.get("cache_max_entries", 2048)
+        self.db = db
 
-        # Simple in-memory cache: key -> CacheEntry
-        self._cache: dict[str, CacheEntry] = {}
+        # In-memory LRU cache: key -> CacheEntry, least recently used first.
+        # The heap holds (expiry, key) so cleanup only visits expired entries.
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._cache_lock = threading.Lock()
 
         if not YFINANCE_AVAILABLE:
             logger.warning("MarketDataProvider initialized but yfinance not available")
 
     def _get_cached(self, key: str) -> Any | None:
-        """Get value from cache if not expired."""
-        if key in self._cache:
-            entry = self._cache[key]
-            if time.time() - entry.created_at < self.cache_ttl_seconds:
-                return entry.data
-            else:
+        """Get value from cache if not expired, falling back to the on-disk cache."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if time.time() - entry.created_at < self.cache_ttl_seconds:
+                    self._cache.move_to_end(key)
+                    return entry.data
                 # Expired, remove it
                 del self._cache[key]
-        return None
+        return self._get_cached_disk(key)
 
     def _set_cached(self, key: str, data: Any) -> None:
         """Store value in cache."""
-        self._cache[key] = CacheEntry(data=data, created_at=time.time())
+        entry = CacheEntry(data=data, created_at=time.time())
+        self._store(key, entry)
+        self._set_cached_disk(key, entry)
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """Insert an entry into the memory cache, evicting expired and LRU entries."""
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (entry.created_at + self.cache_ttl_seconds, key))
+            self._evict_expired(time.time())
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def _get_cached_disk(self, key: str) -> Any | None:
+        """Get an unexpired value from the database cache, promoting it to memory."""
+        if self.db is None:
+            return None
+        try:
+            row = self.db.get_price_cache_entry(key)
+            if row is None:
+                return None
+            payload, created_at = row
+            if time.time() - created_at >= self.cache_ttl_seconds:
+                return None
+            # JSON, not pickle: the database is a shared data file, and the
+            # cached values are only numbers, flags and price dicts
+            data = loads(payload)
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable price cache entry {key}: {e}")
+            return None
+        self._store(key, CacheEntry(data=data, created_at=created_at))
+        return data
+
+    def _set_cached_disk(self, key: str, entry: CacheEntry) -> None:
+        """Persist a cache entry to the database, if one is configured."""
+        if self.db is None:
+            return
+        try:
+            self.db.set_price_cache_entry(key, dumps(entry.data).encode(), entry.created_at)
+        except Exception as e:
+            logger.debug(f"Failed to persist price cache entry {key}: {e}")
 
     def _clean_cache(self) -> None:
         """Remove expired cache entries."""
-        now = time.time()
-        expired = [
-            key
-            for key, entry in self._cache.items()
-            if now - entry.created_at >= self.cache_ttl_seconds
-        ]
-        for key in expired:
-            del self._cache[key]
+        with self._cache_lock:
+            self._evict_expired(time.time())
+
+    def _evict_expired(self, now: float) -> None:
+        """Pop due heap entries, dropping cache entries that have actually expired."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            # The key may have been refreshed since this expiry was pushed
+            entry = self._cache.get(key)
+            if entry is not None and now - entry.created_at >= self.cache_ttl_seconds:
+                del self._cache[key]
 
     def get_price(self, ticker: str, date: datetime | None = None) -> float | None:
         """
@@ -174,13 +246,12 @@ class MarketDataProvider:
             hist = stock.history(start=start, end=end + timedelta(days=1))
 
             if len(hist) >= 2:
-                start_price = float(hist["Close"].iloc[0])
-                end_price = float(hist["Close"].iloc[-1])
-
-                if start_price > 0:
-                    change_pct = ((end_price - start_price) / start_price) * 100
-                    self._set_cached(cache_key, round(change_pct, 2))
-                    return round(change_pct, 2)
+                # Pull the column out once rather than indexing the frame per value
+                closes = hist["Close"].to_numpy()
+                change_pct = _pct_change(closes[0], closes[-1])
+                if change_pct is not None:
+                    self._set_cached(cache_key, change_pct)
+                    return change_pct
 
             logger.debug(f"Insufficient data for price change calculation for {ticker}")
             return None
@@ -214,27 +285,19 @@ class MarketDataProvider:
             hist = stock.history(period="1d", interval="1m")
 
             if not hist.empty:
-                open_price = float(hist["Open"].iloc[0])
-                current_price = float(hist["Close"].iloc[-1])
-
-                if open_price > 0:
-                    change_pct = ((current_price - open_price) / open_price) * 100
-                    # Use shorter cache TTL for intraday data (5 minutes)
-                    self._cache[cache_key] = CacheEntry(
-                        data=round(change_pct, 2), created_at=time.time()
-                    )
-                    return round(change_pct, 2)
+                change_pct = _pct_change(hist["Open"].to_numpy()[0], hist["Close"].to_numpy()[-1])
+                if change_pct is not None:
+                    self._set_cached(cache_key, change_pct)
+                    return change_pct
 
             # Fallback: compare to previous close
             hist_daily = stock.history(period="2d")
             if len(hist_daily) >= 2:
-                prev_close = float(hist_daily["Close"].iloc[-2])
-                current = float(hist_daily["Close"].iloc[-1])
-
-                if prev_close > 0:
-                    change_pct = ((current - prev_close) / prev_close) * 100
-                    self._set_cached(cache_key, round(change_pct, 2))
-                    return round(change_pct, 2)
+                closes = hist_daily["Close"].to_numpy()
+                change_pct = _pct_change(closes[-2], closes[-1])
+                if change_pct is not None:
+                    self._set_cached(cache_key, change_pct)
+                    return change_pct
 
             logger.debug(f"No intraday data available for {ticker}")
             return None
@@ -271,10 +334,10 @@ class MarketDataProvider:
             hist = stock.history(start=start_date, end=end_date)
 
             if not hist.empty:
-                prices = {
-                    date.strftime("%Y-%m-%d"): round(float(row["Close"]), 2)
-                    for date, row in hist.iterrows()
-                }
+                # Vectorized: round and format the whole column instead of iterrows()
+                closes = hist["Close"].round(2)
+                closes.index = closes.index.strftime("%Y-%m-%d")
+                prices = closes.to_dict()
                 self._set_cached(cache_key, prices)
                 return prices
 
@@ -303,26 +366,155 @@ class MarketDataProvider:
             return None
 
         try:
-            current_price = self.get_price(ticker)
+            # The three lookups are independent network calls on a cache miss,
+            # so run them concurrently rather than back to back
+            week_ago = datetime.now() - timedelta(days=7)
+            price_future = self._pool.submit(self.get_price, ticker)
+            day_future = self._pool.submit(self.get_intraday_change, ticker)
+            week_future = self._pool.submit(self.get_price_change, ticker, week_ago)
+
+            current_price = price_future.result()
+            day_change = day_future.result()
+            week_change = week_future.result()
             if current_price is None:
                 return None
 
-            day_change = self.get_intraday_change(ticker)
+            return self._build_context(current_price, day_change, week_change)
 
-            # Calculate week change
-            week_ago = datetime.now() - timedelta(days=7)
-            week_change = self.get_price_change(ticker, week_ago)
+        except Exception as e:
+            logger.warning(f"Failed to get market context for {ticker}: {e}")
+            return None
+
+    def get_market_context_bulk(self, tickers: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Get market context for many tickers at once.
+
+        Equivalent to calling get_market_context() per ticker, but tickers that
+        are not already cached are fetched with two batched yf.download calls
+        (daily closes for the week, 1-minute bars for today) instead of three
+        requests each. Results are cached under the same keys the single-ticker
+        methods use. Tickers the download has no prices for are cached as such
+        too, so they are not downloaded again on every call within the TTL.
+
+        Args:
+            tickers: Stock ticker symbols
+
+        Returns:
+            Dict mapping each ticker to its market context, or None if not available
+        """
+        if not self.enabled or not tickers:
+            return dict.fromkeys(tickers)
+
+        now = datetime.now()
+        week_ago = now - timedelta(days=7)
+
+        def keys(ticker: str) -> tuple[str, str, str]:
+            return (
+                f"price:{ticker}:latest",
+                f"intraday:{ticker}:{now.date()}",
+                f"change:{ticker}:{week_ago.date()}:{now.date()}",
+            )
+
+        def no_data_key(ticker: str) -> str:
+            return f"nodata:{ticker}:{now.date()}"
+
+        results: dict[str, dict[str, Any] | None] = {}
+        to_fetch = []
+        for ticker in dict.fromkeys(tickers):
+            if self._get_cached(no_data_key(ticker)):
+                results[ticker] = None
+                continue
+            cached = [self._get_cached(key) for key in keys(ticker)]
+            if all(value is not None for value in cached):
+                results[ticker] = self._build_context(*cached)
+            else:
+                to_fetch.append(ticker)
 
-            return {
-                "current_price": round(current_price, 2),
-                "day_change_pct": day_change,
-                "week_change_pct": week_change,
-                "timestamp": datetime.now().isoformat(),
-            }
+        if not to_fetch:
+            return results
 
+        try:
+            daily = yf.download(
+                to_fetch,
+                start=week_ago,
+                end=now + timedelta(days=1),
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
+            intraday = yf.download(
+                to_fetch,
+                period="1d",
+                interval="1m",
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
         except Exception as e:
-            logger.warning(f"Failed to get market context for {ticker}: {e}")
+            logger.warning(f"Failed to download market data for {len(to_fetch)} tickers: {e}")
+            results.update((ticker, None) for ticker in to_fetch)
+            return results
+
+        for ticker in to_fetch:
+            price_key, intraday_key, change_key = keys(ticker)
+            closes = self._frame_column(daily, ticker, "Close")
+            if closes is None:
+                logger.debug(f"No price data available for {ticker}")
+                self._set_cached(no_data_key(ticker), True)
+                results[ticker] = None
+                continue
+
+            closes = closes.to_numpy()
+            current_price = float(closes[-1])
+            self._set_cached(price_key, current_price)
+
+            week_change = _pct_change(closes[0], closes[-1]) if len(closes) >= 2 else None
+            if week_change is not None:
+                self._set_cached(change_key, week_change)
+
+            # Today's move from the open, falling back to the previous close
+            day_change = None
+            opens = self._frame_column(intraday, ticker, "Open")
+            minute_closes = self._frame_column(intraday, ticker, "Close")
+            if opens is not None and minute_closes is not None:
+                day_change = _pct_change(opens.to_numpy()[0], minute_closes.to_numpy()[-1])
+            if day_change is None and len(closes) >= 2:
+                day_change = _pct_change(closes[-2], closes[-1])
+            if day_change is not None:
+                self._set_cached(intraday_key, day_change)
+
+            results[ticker] = self._build_context(current_price, day_change, week_change)
+
+        return results
+
+    @staticmethod
+    def _frame_column(frame: Any, ticker: str, field: str) -> Any | None:
+        """Get one ticker's non-null column from a (possibly multi-ticker) download"""
+        if frame is None or frame.empty:
+            return None
+        try:
+            if frame.columns.nlevels > 1:
+                column = frame[ticker][field]
+            else:
+                column = frame[field]
+        except KeyError:
             return None
+        column = column.dropna()
+        return column if not column.empty else None
+
+    @staticmethod
+    def _build_context(
+        current_price: float, day_change: float | None, week_change: float | None
+    ) -> dict[str, Any]:
+        """Assemble the market context dict returned for a ticker"""
+        return {
+            "current_price": round(current_price, 2),
+            "day_change_pct": day_change,
+            "week_change_pct": week_change,
+            "timestamp": datetime.now().isoformat(),
+        }
 
     def is_significant_move(
         self, ticker: str, threshold_pct: float = 2.0, days: int = 1
@@ -5,27 +5,190 @@ This module provides machine learning capabilities to augment the rule-based
 pattern detection with anomaly detection and trend classification.
 """
 
+from __future__ import annotations
+
 import logging
-from datetime import datetime, timedelta
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from importlib.util import find_spec
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
-# Try to import sklearn, but allow graceful fallback
-try:
-    import joblib
-    from sklearn.ensemble import IsolationForest, RandomForestClassifier
-    from sklearn.preprocessing import StandardScaler
-
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+# numpy, scikit-learn and joblib are imported where first used, so a deployment
+# with ML detection disabled never loads them; here we only check they exist
+SKLEARN_AVAILABLE = find_spec("sklearn") is not None and find_spec("joblib") is not None
+if not SKLEARN_AVAILABLE:
     logger.warning("scikit-learn not available. ML detection features disabled.")
 
 
+# Number of features produced per company by the feature extractors
+N_FEATURES = 17
+
+# Raw company statistics read from each company dict, in feature order
+_BASE_FEATURE_KEYS = (
+    "count_1h",
+    "count_6h",
+    "count_24h",
+    "count_7d",
+    "sentiment_mean",
+    "sentiment_std",
+    "sentiment_mean_24h",
+    "sentiment_std_24h",
+)
+
+
+@dataclass(slots=True)
+class CompanyFeatures:
+    """News statistics for one company, as fed to the feature extractors."""
+
+    ticker: str = ""
+    count_1h: float = 0.0
+    count_6h: float = 0.0
+    count_24h: float = 0.0
+    count_7d: float = 0.0
+    sentiment_mean: float = 0.0
+    sentiment_std: float = 0.0
+    sentiment_mean_24h: float = 0.0
+    sentiment_std_24h: float = 0.0
+    had_alert: bool = False
+
+
+_get_base_features = attrgetter(*_BASE_FEATURE_KEYS)
+
+
+def _base_features(company_data: CompanyFeatures | dict[str, Any]) -> tuple:
+    """The raw statistics in _BASE_FEATURE_KEYS order, defaulting missing ones to 0."""
+    if isinstance(company_data, CompanyFeatures):
+        return _get_base_features(company_data)
+    return tuple(company_data.get(key, 0) for key in _BASE_FEATURE_KEYS)
+
+
+def _had_alert(company_data: CompanyFeatures | dict[str, Any]) -> bool:
+    """Whether the company had a recent alert (the training label)."""
+    if isinstance(company_data, CompanyFeatures):
+        return company_data.had_alert
+    return bool(company_data.get("had_alert", False))
+
+
+# Article count windows (hours) behind the count_1h, count_6h, count_24h and
+# count_7d features
+_COUNT_WINDOW_HOURS = (1, 6, 24, 168)
+
+# Sentiment statistics for a company with no recent scored articles
+_EMPTY_SENTIMENT_STATS = {"mean": 0, "std": 0, "mean_24h": 0, "std_24h": 0}
+
+
+# Results returned while ML detection is disabled or untrained; callers get
+# copies, as they may add to or change them
+_NOT_READY_ERROR = "ML detection not enabled or not trained"
+_NOT_READY_ANOMALY_RESULT = {
+    "is_anomaly": False,
+    "anomaly_score": 0.0,
+    "normalized_score": 0.0,
+    "error": _NOT_READY_ERROR,
+}
+_NOT_READY_PATTERN_RESULT = {
+    "is_significant": False,
+    "confidence": 0.0,
+    "prediction_class": 0,
+    "error": _NOT_READY_ERROR,
+}
+
+
+def _not_ready_ml_score() -> dict[str, Any]:
+    """A fresh get_ml_score result for when ML detection isn't ready"""
+    return {
+        "ml_score": 0.0,
+        "anomaly_result": dict(_NOT_READY_ANOMALY_RESULT),
+        "pattern_result": dict(_NOT_READY_PATTERN_RESULT),
+        "is_trained": False,
+        "training_samples": 0,
+    }
+
+
+def _utc_cutoff(**delta: float) -> str:
+    """
+    UTC time ``delta`` ago, in the format SQLite's datetime() returns.
+
+    Bound as a query parameter, the cutoff is computed once in Python and the
+    comparison can use an index range scan on the timestamp column.
+    """
+    return (datetime.now(UTC) - timedelta(**delta)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Isolation forest scoring spreads the trees of batches of at least
+# _PARALLEL_SCORING_MIN_ROWS over this many threads; the tree traversal
+# releases the GIL, and threads avoid the process pool's pickling cost. Below
+# that size, or on machines with under four cores, it stays sequential.
+_SCORING_THREADS = min(4, (os.cpu_count() or 1) // 2)
+_PARALLEL_SCORING_MIN_ROWS = 256
+
+# Largest batch _trend_proba routes through the _FlatForest; beyond it the
+# numpy gathers cost more than sklearn's per-tree calls
+_FLAT_FOREST_MAX_ROWS = 128
+
+
+class _FlatForest:
+    """
+    A fitted tree ensemble's classifier trees packed into flat node arrays.
+
+    Every tree's nodes are concatenated into one set of arrays, so a batch is
+    routed through all trees at once, one tree level per step, in a handful of
+    vectorized numpy operations. Leaves point back at themselves, which lets
+    shallower paths sit still until the deepest tree has finished.
+    """
+
+    __slots__ = ("roots", "feature", "threshold", "children", "value", "depth")
+
+    def __init__(self, estimators: list[Any]):
+        import numpy as np
+
+        trees = [estimator.tree_ for estimator in estimators]
+        sizes = [tree.node_count for tree in trees]
+        self.roots = np.cumsum([0, *sizes[:-1]])[:, None]
+
+        self.feature = np.concatenate([np.maximum(tree.feature, 0) for tree in trees])
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+
+        left, right = [], []
+        for root, tree in zip(self.roots[:, 0], trees, strict=True):
+            nodes = np.arange(root, root + tree.node_count)
+            is_leaf = tree.children_left < 0
+            left.append(np.where(is_leaf, nodes, tree.children_left + root))
+            right.append(np.where(is_leaf, nodes, tree.children_right + root))
+        # Row 0 is the left child of every node, row 1 the right
+        self.children = np.stack([np.concatenate(left), np.concatenate(right)])
+
+        # Per-node class probabilities, as each tree's predict_proba reports them
+        value = np.concatenate([tree.value[:, 0, :] for tree in trees]).astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        self.value = value / totals
+
+        self.depth = max(tree.max_depth for tree in trees)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Mean class probability over the trees, for float32 rows X."""
+        import numpy as np
+
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots, X.shape[0], axis=1)
+        for _ in range(self.depth):
+            # Same test as sklearn's trees: float32 feature <= float64 threshold
+            go_right = X[rows, self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[go_right.view(np.int8), nodes]
+        return self.value[nodes].mean(axis=0)
+
+
 class MLPatternDetector:
     """
     Machine learning pattern detector for news analysis.
@@ -53,10 +216,22 @@ class MLPatternDetector:
         self.trend_classifier: Any | None = None
         self.scaler: Any | None = None
 
+        # Fitted scaler parameters for the prediction path: x_scaled = (x - mean) * inv_scale
+        self._mean: np.ndarray | None = None
+        self._inv_scale: np.ndarray | None = None
+        # Trend classifier packed for prediction, built on first use after fitting
+        self._trend_forest: _FlatForest | None = None
+        # Per-thread (1, N_FEATURES) buffers the single-company predictions
+        # extract and scale into, reused across calls
+        self._scratch = threading.local()
+
         # Training state
         self.is_trained = False
         self.last_training_time: datetime | None = None
         self.training_sample_count = 0
+        # (row count, latest mentioned_at) of the 30-day mention window the
+        # models were last trained on; see _training_fingerprint
+        self._last_training_fingerprint: tuple | None = None
 
         if self.enabled:
             self._initialize_models()
@@ -67,10 +242,22 @@ class MLPatternDetector:
             logger.warning("Cannot initialize ML models: scikit-learn not available")
             return
 
+        try:
+            from sklearn.ensemble import IsolationForest, RandomForestClassifier
+            from sklearn.preprocessing import StandardScaler
+        except ImportError as e:
+            logger.warning("Cannot initialize ML models", extra={"error": str(e)})
+            self.enabled = False
+            return
+
         # Isolation Forest for anomaly detection
-        # Contamination is the expected proportion of outliers
+        # Contamination is the expected proportion of outliers. Each tree is
+        # built on at most 256 samples ("auto"), the isolation forest paper's
+        # default; 50 trees score as well as 100 on these 17 features and halve
+        # the traversals per prediction.
         self.anomaly_detector = IsolationForest(
-            n_estimators=100,
+            n_estimators=50,
+            max_samples="auto",
             contamination=0.1,  # Expect ~10% anomalies
             random_state=42,
             n_jobs=-1,
@@ -89,7 +276,21 @@ class MLPatternDetector:
 
         logger.info("ML models initialized")
 
-    def extract_features(self, company_data: dict[str, Any]) -> np.ndarray:
+    def _set_n_jobs(self, n_jobs: int):
+        """
+        Set the worker count on both forests.
+
+        Fitting benefits from all cores, but predictions here are on one row
+        or a small batch, where starting joblib workers costs more than the
+        prediction itself.
+        """
+        for model in (self.anomaly_detector, self.trend_classifier):
+            if model is not None:
+                model.n_jobs = n_jobs
+
+    def extract_features(
+        self, company_data: CompanyFeatures | dict[str, Any], now: datetime | None = None
+    ) -> np.ndarray:
         """
         Extract ML features from company news data.
 
@@ -100,25 +301,37 @@ class MLPatternDetector:
         - Rolling averages and ratios
 
         Args:
-            company_data: Dictionary containing company news statistics
+            company_data: Company news statistics, as CompanyFeatures or a dict
+            now: Time the time features are taken from (defaults to now); pass
+                it in when extracting features for many companies
 
         Returns:
             Feature vector as numpy array
         """
-        # Article counts
-        count_1h = company_data.get("count_1h", 0)
-        count_6h = company_data.get("count_6h", 0)
-        count_24h = company_data.get("count_24h", 0)
-        count_7d = company_data.get("count_7d", 0)
-
-        # Sentiment statistics
-        sentiment_mean = company_data.get("sentiment_mean", 0.0)
-        sentiment_std = company_data.get("sentiment_std", 0.0)
-        sentiment_mean_24h = company_data.get("sentiment_mean_24h", 0.0)
-        sentiment_std_24h = company_data.get("sentiment_std_24h", 0.0)
+        import numpy as np
+
+        return np.array(self._feature_row(company_data, now)).reshape(1, -1)
+
+    @staticmethod
+    def _feature_row(
+        company_data: CompanyFeatures | dict[str, Any], now: datetime | None = None
+    ) -> tuple:
+        """The N_FEATURES values of one company's feature vector, in column order."""
+        # Article counts and sentiment statistics
+        (
+            count_1h,
+            count_6h,
+            count_24h,
+            count_7d,
+            sentiment_mean,
+            sentiment_std,
+            sentiment_mean_24h,
+            sentiment_std_24h,
+        ) = _base_features(company_data)
 
         # Time features
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         hour_of_day = now.hour
         day_of_week = now.weekday()
 
@@ -137,37 +350,182 @@ class MLPatternDetector:
         # Sentiment change
         sentiment_change = sentiment_mean - sentiment_mean_24h
 
-        # Create feature vector
-        features = np.array(
-            [
-                count_1h,
-                count_6h,
-                count_24h,
-                count_7d,
-                sentiment_mean,
-                sentiment_std,
-                sentiment_mean_24h,
-                sentiment_std_24h,
-                hour_of_day,
-                day_of_week,
-                avg_daily,
-                avg_hourly,
-                ratio_1h_to_daily,
-                ratio_6h_to_24h,
-                ratio_24h_to_7d,
-                velocity_6h,
-                sentiment_change,
-            ]
+        return (
+            count_1h,
+            count_6h,
+            count_24h,
+            count_7d,
+            sentiment_mean,
+            sentiment_std,
+            sentiment_mean_24h,
+            sentiment_std_24h,
+            hour_of_day,
+            day_of_week,
+            avg_daily,
+            avg_hourly,
+            ratio_1h_to_daily,
+            ratio_6h_to_24h,
+            ratio_24h_to_7d,
+            velocity_6h,
+            sentiment_change,
         )
 
-        return features.reshape(1, -1)
+    def extract_features_batch(
+        self, company_list: list[CompanyFeatures | dict[str, Any]], now: datetime | None = None
+    ) -> np.ndarray:
+        """
+        Extract ML features for many companies at once.
+
+        Produces the same 17 features as extract_features, one row per company,
+        computing each derived feature as a single column operation.
 
-    def train(self, historical_data: list[dict[str, Any]]) -> bool:
+        Args:
+            company_list: Company news statistics, as CompanyFeatures or dicts
+            now: Time the time features are taken from (defaults to now)
+
+        Returns:
+            Feature matrix of shape (len(company_list), 17) as float32
+        """
+        import numpy as np
+
+        n = len(company_list)
+        X = np.empty((n, N_FEATURES), dtype=np.float32)
+        if n == 0:
+            return X
+
+        base = np.array([_base_features(data) for data in company_list], dtype=np.float64)
+        count_1h, count_6h, count_24h, count_7d = base[:, 0], base[:, 1], base[:, 2], base[:, 3]
+        sentiment_mean, sentiment_mean_24h = base[:, 4], base[:, 6]
+
+        # Raw counts and sentiment statistics
+        X[:, :8] = base
+
+        # Time features are the same for every row
+        if now is None:
+            now = datetime.now()
+        X[:, 8] = now.hour
+        X[:, 9] = now.weekday()
+
+        # Derived features - rolling averages
+        avg_daily = np.where(count_7d > 0, count_7d / 7.0, 0.0)
+        avg_hourly = np.where(count_24h > 0, count_24h / 24.0, 0.0)
+        X[:, 10] = avg_daily
+        X[:, 11] = avg_hourly
+
+        # Ratios (zero where the denominator is zero)
+        zeros = np.zeros(n)
+        X[:, 12] = np.divide(count_1h, avg_hourly, out=zeros.copy(), where=avg_hourly > 0)
+        X[:, 13] = np.divide(count_6h, count_24h, out=zeros.copy(), where=count_24h > 0)
+        X[:, 14] = np.divide(count_24h, count_7d, out=zeros, where=count_7d > 0)
+
+        # Velocity (rate of change)
+        X[:, 15] = np.where(count_24h > 0, count_6h - (count_24h - count_6h) / 3, 0.0)
+
+        # Sentiment change
+        X[:, 16] = sentiment_mean - sentiment_mean_24h
+
+        return X
+
+    def _set_scaler_params(self, mean: np.ndarray, scale: np.ndarray):
+        """Cache the scaler's mean and reciprocal scale as float32 arrays."""
+        import numpy as np
+
+        self._mean = np.asarray(mean, dtype=np.float32)
+        self._inv_scale = (1.0 / np.asarray(scale, dtype=np.float64)).astype(np.float32)
+
+    def _scale(self, features: np.ndarray) -> np.ndarray:
+        """
+        Standardize features with the fitted scaler's parameters.
+
+        Same result as scaler.transform, as one subtract and multiply without
+        the input validation it runs on every call. The result is float32,
+        the dtype the trees compare in, whatever the input dtype.
+        """
+        import numpy as np
+
+        if self._mean is None:
+            self._set_scaler_params(self.scaler.mean_, self.scaler.scale_)
+        scaled = np.subtract(features, self._mean, dtype=np.float32)
+        scaled *= self._inv_scale
+        return scaled
+
+    def _scaled_row(self, company_data: CompanyFeatures | dict[str, Any]) -> np.ndarray:
+        """
+        One company's scaled (1, N_FEATURES) feature row, in this thread's scratch buffer.
+
+        Extracts and scales in place into buffers kept per thread, so scoring a
+        company allocates no arrays in steady state. The returned array is
+        overwritten by the thread's next call.
+        """
+        import numpy as np
+
+        buffers = getattr(self._scratch, "buffers", None)
+        if buffers is None:
+            raw = np.empty((1, N_FEATURES), dtype=np.float32)
+            buffers = self._scratch.buffers = (raw, np.empty_like(raw))
+        raw, scaled = buffers
+
+        if self._mean is None:
+            self._set_scaler_params(self.scaler.mean_, self.scaler.scale_)
+        raw[0] = self._feature_row(company_data)
+        np.subtract(raw, self._mean, out=scaled)
+        scaled *= self._inv_scale
+        return scaled
+
+    def _anomaly_scores(self, features_scaled: np.ndarray) -> np.ndarray:
+        """
+        IsolationForest.decision_function without the per-call input validation.
+
+        The scaled features are always a finite 2-D array from our own
+        pipeline, so only the float32 contiguous layout the trees need is
+        ensured here. Large batches are scored on _SCORING_THREADS threads.
+        """
+        import numpy as np
+
+        score_samples = getattr(self.anomaly_detector, "_score_samples", None)
+        if score_samples is None:  # Older scikit-learn
+            return self.anomaly_detector.decision_function(features_scaled)
+        X = np.ascontiguousarray(features_scaled, dtype=np.float32)
+        if _SCORING_THREADS > 1 and X.shape[0] >= _PARALLEL_SCORING_MIN_ROWS:
+            import joblib
+
+            with joblib.parallel_config(backend="threading", n_jobs=_SCORING_THREADS):
+                return score_samples(X) - self.anomaly_detector.offset_
+        return score_samples(X) - self.anomaly_detector.offset_
+
+    def _trend_proba(self, features_scaled: np.ndarray) -> np.ndarray:
+        """
+        RandomForestClassifier.predict_proba without the per-call input validation.
+
+        Small batches, down to the single row predict_pattern scores, go
+        through the classifier packed into a _FlatForest, which routes them
+        through all trees together instead of calling into each tree in turn.
+        Past _FLAT_FOREST_MAX_ROWS the per-tree Cython path is faster again;
+        there each tree's output is summed into one preallocated array, so peak
+        memory stays at two (n_samples, n_classes) arrays. Both match
+        predict_proba.
+        """
+        import numpy as np
+
+        X = np.ascontiguousarray(features_scaled, dtype=np.float32)
+        estimators = self.trend_classifier.estimators_
+        if X.shape[0] <= _FLAT_FOREST_MAX_ROWS:
+            if self._trend_forest is None:
+                self._trend_forest = _FlatForest(estimators)
+            return self._trend_forest.predict_proba(X)
+
+        proba = np.zeros((X.shape[0], self.trend_classifier.n_classes_), dtype=np.float64)
+        for estimator in estimators:
+            proba += estimator.predict_proba(X, check_input=False)
+        proba /= len(estimators)
+        return proba
+
+    def train(self, historical_data: list[CompanyFeatures | dict[str, Any]]) -> bool:
         """
         Train ML models on historical pattern data.
 
         Args:
-            historical_data: List of historical company data dictionaries
+            historical_data: Historical company data, as CompanyFeatures or dicts
 
         Returns:
             True if training successful, False otherwise
@@ -190,40 +548,48 @@ class MLPatternDetector:
             )
             return False
 
-        try:
-            # Extract features from all historical data
-            features_list = []
-            labels = []
+        import numpy as np
 
-            for data in historical_data:
-                features = self.extract_features(data)
-                features_list.append(features.flatten())
-
-                # Generate label based on rule-based detection results
-                # 1 = significant pattern, 0 = normal
-                label = 1 if data.get("had_alert", False) else 0
-                labels.append(label)
+        try:
+            # Extract features from all historical data in one matrix, reading
+            # the clock once for the whole batch
+            now = datetime.now()
+            X = self.extract_features_batch(historical_data, now=now)
+
+            # Generate labels based on rule-based detection results
+            # 1 = significant pattern, 0 = normal
+            y = np.fromiter(
+                (1 if _had_alert(data) else 0 for data in historical_data),
+                dtype=np.int64,
+                count=len(historical_data),
+            )
+            positive_samples = int(y.sum())
 
-            X = np.array(features_list)
-            y = np.array(labels)
+            # Fit across all cores; predictions drop back to one job afterwards
+            self._set_n_jobs(-1)
 
-            # Fit the scaler
-            X_scaled = self.scaler.fit_transform(X)
+            # Fit the scaler. X is float32 and StandardScaler keeps the dtype,
+            # so the forests fit on it without their own float32 copy
+            X_scaled = self.scaler.fit_transform(X).astype(np.float32, copy=False)
+            self._set_scaler_params(self.scaler.mean_, self.scaler.scale_)
 
             # Train anomaly detector (unsupervised)
             self.anomaly_detector.fit(X_scaled)
 
             # Train trend classifier (supervised) if we have labeled data
-            if sum(labels) > 0:  # At least some positive examples
+            if positive_samples > 0:  # At least some positive examples
                 self.trend_classifier.fit(X_scaled, y)
                 logger.info(
                     "Trend classifier trained",
                     extra={
-                        "positive_samples": sum(labels),
-                        "total_samples": len(labels),
+                        "positive_samples": positive_samples,
+                        "total_samples": len(y),
                     },
                 )
 
+            self._set_n_jobs(1)
+            self._trend_forest = None
+
             self.is_trained = True
             self.last_training_time = datetime.now()
             self.training_sample_count = len(historical_data)
@@ -256,29 +622,23 @@ class MLPatternDetector:
             - normalized_score: Score normalized to 0-1 range (higher = more anomalous)
         """
         if not self.enabled or not self.is_trained:
-            return {
-                "is_anomaly": False,
-                "anomaly_score": 0.0,
-                "normalized_score": 0.0,
-                "error": "ML detection not enabled or not trained",
-            }
+            return dict(_NOT_READY_ANOMALY_RESULT)
 
-        try:
-            features = self.extract_features(company_data)
-            features_scaled = self.scaler.transform(features)
+        import numpy as np
 
-            # Get anomaly prediction (-1 = anomaly, 1 = normal)
-            prediction = self.anomaly_detector.predict(features_scaled)[0]
+        try:
+            features_scaled = self._scaled_row(company_data)
 
             # Get anomaly score (more negative = more anomalous)
-            # decision_function returns the anomaly score
-            raw_score = self.anomaly_detector.decision_function(features_scaled)[0]
+            raw_score = self._anomaly_scores(features_scaled)[0]
 
             # Normalize score to 0-1 range (higher = more anomalous)
             # Raw scores typically range from about -0.5 to 0.5
-            normalized_score = max(0, min(1, (0.5 - raw_score)))
+            normalized_score = np.clip(0.5 - raw_score, 0.0, 1.0)
 
-            is_anomaly = prediction == -1 and normalized_score >= self.anomaly_threshold
+            # Anomalous if IsolationForest.predict would say so (negative score)
+            # and the normalized score clears the threshold
+            is_anomaly = bool(raw_score < 0 and normalized_score >= self.anomaly_threshold)
 
             return {
                 "is_anomaly": is_anomaly,
@@ -309,22 +669,16 @@ class MLPatternDetector:
             - prediction_class: 0 or 1
         """
         if not self.enabled or not self.is_trained:
-            return {
-                "is_significant": False,
-                "confidence": 0.0,
-                "prediction_class": 0,
-                "error": "ML detection not enabled or not trained",
-            }
+            return dict(_NOT_READY_PATTERN_RESULT)
 
-        try:
-            features = self.extract_features(company_data)
-            features_scaled = self.scaler.transform(features)
+        import numpy as np
 
-            # Get prediction
-            prediction = self.trend_classifier.predict(features_scaled)[0]
+        try:
+            features_scaled = self._scaled_row(company_data)
 
-            # Get probability
-            probabilities = self.trend_classifier.predict_proba(features_scaled)[0]
+            # Get probability, and the prediction as the most probable class
+            probabilities = self._trend_proba(features_scaled)[0]
+            prediction = self.trend_classifier.classes_[np.argmax(probabilities)]
             confidence = probabilities[1] if len(probabilities) > 1 else probabilities[0]
 
             return {
@@ -357,6 +711,9 @@ class MLPatternDetector:
             - anomaly_result: Anomaly detection results
             - pattern_result: Pattern prediction results
         """
+        if not self.enabled or not self.is_trained:
+            return _not_ready_ml_score()
+
         anomaly_result = self.detect_anomalies(company_data)
         pattern_result = self.predict_pattern(company_data)
 
@@ -378,6 +735,100 @@ class MLPatternDetector:
             "training_samples": self.training_sample_count,
         }
 
+    def get_ml_score_batch(self, company_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Get combined ML scores for many companies at once.
+
+        Returns the same dictionaries as calling get_ml_score per company, but
+        extracts, scales and scores every company with one call per model.
+
+        Args:
+            company_list: List of company news statistics dictionaries
+
+        Returns:
+            List of combined ML analysis dictionaries, in input order
+        """
+        if not self.enabled or not self.is_trained:
+            return [_not_ready_ml_score() for _ in company_list]
+        if not company_list:
+            return []
+
+        import numpy as np
+
+        n = len(company_list)
+        anomaly_error = pattern_error = None
+        normalized_scores = confidences = np.zeros(n)
+
+        try:
+            features_scaled = self._scale(self.extract_features_batch(company_list))
+        except Exception as e:
+            logger.error("ML feature extraction failed", extra={"error": str(e)})
+            anomaly_error = pattern_error = str(e)
+
+        if anomaly_error is None:
+            try:
+                raw_scores = self._anomaly_scores(features_scaled)
+                # Normalize scores to 0-1 range (higher = more anomalous)
+                normalized_scores = np.clip(0.5 - raw_scores, 0.0, 1.0)
+                anomalies = (raw_scores < 0) & (normalized_scores >= self.anomaly_threshold)
+            except Exception as e:
+                logger.error("Anomaly detection failed", extra={"error": str(e)})
+                anomaly_error = str(e)
+
+        if pattern_error is None:
+            try:
+                probabilities = self._trend_proba(features_scaled)
+                predictions = self.trend_classifier.classes_[np.argmax(probabilities, axis=1)]
+                confidences = probabilities[:, 1 if probabilities.shape[1] > 1 else 0]
+            except Exception as e:
+                logger.error("Pattern prediction failed", extra={"error": str(e)})
+                pattern_error = str(e)
+
+        # Anomaly detection weight: 0.4, Pattern classification weight: 0.6
+        combined_scores = normalized_scores * 0.4 + confidences * 0.6
+
+        results = []
+        for i in range(n):
+            if anomaly_error is None:
+                anomaly_result = {
+                    "is_anomaly": bool(anomalies[i]),
+                    "anomaly_score": float(raw_scores[i]),
+                    "normalized_score": float(normalized_scores[i]),
+                }
+            else:
+                anomaly_result = {
+                    "is_anomaly": False,
+                    "anomaly_score": 0.0,
+                    "normalized_score": 0.0,
+                    "error": anomaly_error,
+                }
+
+            if pattern_error is None:
+                pattern_result = {
+                    "is_significant": bool(predictions[i] == 1),
+                    "confidence": float(confidences[i]),
+                    "prediction_class": int(predictions[i]),
+                }
+            else:
+                pattern_result = {
+                    "is_significant": False,
+                    "confidence": 0.0,
+                    "prediction_class": 0,
+                    "error": pattern_error,
+                }
+
+            results.append(
+                {
+                    "ml_score": float(combined_scores[i]),
+                    "anomaly_result": anomaly_result,
+                    "pattern_result": pattern_result,
+                    "is_trained": self.is_trained,
+                    "training_samples": self.training_sample_count,
+                }
+            )
+
+        return results
+
     def save_model(self, path: str | None = None) -> bool:
         """
         Save trained models to disk.
@@ -392,6 +843,9 @@ class MLPatternDetector:
             logger.warning("Cannot save untrained models")
             return False
 
+        import joblib
+        import numpy as np
+
         save_path = Path(path or self.model_path)
         save_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -403,10 +857,24 @@ class MLPatternDetector:
                 "is_trained": self.is_trained,
                 "last_training_time": self.last_training_time,
                 "training_sample_count": self.training_sample_count,
+                "training_fingerprint": self._last_training_fingerprint,
                 "config": self.ml_config,
             }
 
-            joblib.dump(model_data, save_path)
+            # Stored uncompressed so load_model can memory-map the arrays;
+            # joblib can't mmap a compressed file. Written beside the model and
+            # swapped in, as rewriting it in place would truncate the pages a
+            # loaded model (here or in another process) still has mapped.
+            tmp_path = save_path.with_name(save_path.name + ".tmp")
+            joblib.dump(model_data, tmp_path)
+            os.replace(tmp_path, save_path)
+
+            # Scaler parameters alongside, so loading them needs no unpickling
+            np.savez(
+                self._scaler_params_path(save_path),
+                mean=self.scaler.mean_.astype(np.float32),
+                scale=self.scaler.scale_.astype(np.float32),
+            )
 
             logger.info("ML models saved", extra={"path": str(save_path)})
             return True
@@ -415,6 +883,22 @@ class MLPatternDetector:
             logger.error("Failed to save ML models", extra={"error": str(e)})
             return False
 
+    @staticmethod
+    def _scaler_params_path(model_path: Path) -> Path:
+        """Path of the scaler parameter file saved next to a model file."""
+        return model_path.with_name(model_path.name + ".scaler.npz")
+
+    def _load_scaler_params(self, model_path: Path):
+        """Load saved scaler parameters, or take them from the loaded scaler."""
+        import numpy as np
+
+        try:
+            with np.load(self._scaler_params_path(model_path)) as params:
+                self._set_scaler_params(params["mean"], params["scale"])
+        except (OSError, KeyError, ValueError):
+            # Saved before the parameter file existed
+            self._set_scaler_params(self.scaler.mean_, self.scaler.scale_)
+
     def load_model(self, path: str | None = None) -> bool:
         """
         Load trained models from disk.
@@ -435,8 +919,13 @@ class MLPatternDetector:
             logger.debug("No saved model found", extra={"path": str(load_path)})
             return False
 
+        import joblib
+
         try:
-            model_data = joblib.load(load_path)
+            # Memory-map the model's numpy arrays instead of reading them into
+            # fresh heap copies. Tree node arrays are still copied by sklearn on
+            # unpickling; the mapping covers the rest (classes, scaler, seeds).
+            model_data = joblib.load(load_path, mmap_mode="r")
 
             self.anomaly_detector = model_data["anomaly_detector"]
             self.trend_classifier = model_data["trend_classifier"]
@@ -444,6 +933,10 @@ class MLPatternDetector:
             self.is_trained = model_data["is_trained"]
             self.last_training_time = model_data.get("last_training_time")
             self.training_sample_count = model_data.get("training_sample_count", 0)
+            self._last_training_fingerprint = model_data.get("training_fingerprint")
+            self._set_n_jobs(1)
+            self._trend_forest = None
+            self._load_scaler_params(load_path)
 
             logger.info(
                 "ML models loaded",
@@ -490,6 +983,16 @@ class MLPatternDetector:
                     return False
 
         try:
+            # Skip the fetch and refit when no mention has arrived or aged out
+            # of the training window since the last training
+            fingerprint = self._training_fingerprint(db)
+            if self.is_trained and not force and fingerprint == self._last_training_fingerprint:
+                logger.debug(
+                    "Skipping retraining, training data unchanged",
+                    extra={"fingerprint": fingerprint},
+                )
+                return False
+
             # Get historical data from database
             historical_data = self._fetch_historical_data(db)
 
@@ -507,6 +1010,7 @@ class MLPatternDetector:
             success = self.train(historical_data)
 
             if success:
+                self._last_training_fingerprint = fingerprint
                 # Save the trained models
                 self.save_model()
 
@@ -516,15 +1020,39 @@ class MLPatternDetector:
             logger.error("Auto-training failed", extra={"error": str(e)})
             return False
 
-    def _fetch_historical_data(self, db) -> list[dict[str, Any]]:
+    @staticmethod
+    def _training_fingerprint(db) -> tuple:
+        """
+        Cheap fingerprint of the 30-day mention window the models train on.
+
+        Row count and latest mentioned_at together change whenever a mention
+        is added to the window or ages out of it, at the cost of one indexed
+        aggregate instead of the full fetch.
+        """
+        with db.get_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT COUNT(*), MAX(mentioned_at)
+                FROM company_mentions
+                WHERE mentioned_at > ?
+                """,
+                (_utc_cutoff(days=30),),
+            ).fetchone()
+        return tuple(row)
+
+    def _fetch_historical_data(self, db) -> list[CompanyFeatures]:
         """
         Fetch historical data from database for training.
 
+        Counts, sentiment statistics and recent alerts are each fetched for all
+        companies in one grouped query, run concurrently, rather than several
+        queries per company.
+
         Args:
             db: Database instance
 
         Returns:
-            List of historical company data dictionaries
+            Historical company data, one CompanyFeatures per company
         """
         historical_data = []
 
@@ -536,108 +1064,118 @@ class MLPatternDetector:
                     """
                     SELECT DISTINCT company_ticker, company_name
                     FROM company_mentions
-                    WHERE mentioned_at > datetime('now', '-30 days')
-                    """
+                    WHERE mentioned_at > ?
+                    """,
+                    (_utc_cutoff(days=30),),
                 ).fetchall()
 
+                # Article counts at the 1h, 6h, 24h and 7d windows, sentiment and
+                # alerts are independent queries; sqlite3 releases the GIL while
+                # a query runs, so run them side by side on per-thread connections
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    counts_future = pool.submit(
+                        db.get_article_counts_by_company, _COUNT_WINDOW_HOURS
+                    )
+                    sentiment_future = pool.submit(
+                        lambda: self._get_sentiment_stats_by_company(db.get_connection())
+                    )
+                    alerts_future = pool.submit(
+                        lambda: self._get_recently_alerted_tickers(db.get_connection())
+                    )
+                    counts_by_ticker = counts_future.result()
+                    sentiment_by_ticker = sentiment_future.result()
+                    alerted_tickers = alerts_future.result()
+
+                no_counts = [0] * len(_COUNT_WINDOW_HOURS)
                 for company in companies:
                     ticker = company["company_ticker"]
-
-                    # Get article counts at different time windows
-                    count_1h = db.get_article_count_for_company(ticker, hours=1)
-                    count_6h = db.get_article_count_for_company(ticker, hours=6)
-                    count_24h = db.get_article_count_for_company(ticker, hours=24)
-                    count_7d = db.get_article_count_for_company(ticker, hours=168)
-
-                    # Get sentiment data
-                    sentiment_data = self._get_sentiment_stats(conn, ticker)
-
-                    # Check if there was a recent alert
-                    had_alert = self._check_for_recent_alert(conn, ticker)
-
-                    company_data = {
-                        "ticker": ticker,
-                        "count_1h": count_1h,
-                        "count_6h": count_6h,
-                        "count_24h": count_24h,
-                        "count_7d": count_7d,
-                        "sentiment_mean": sentiment_data.get("mean", 0),
-                        "sentiment_std": sentiment_data.get("std", 0),
-                        "sentiment_mean_24h": sentiment_data.get("mean_24h", 0),
-                        "sentiment_std_24h": sentiment_data.get("std_24h", 0),
-                        "had_alert": had_alert,
-                    }
-
-                    historical_data.append(company_data)
+                    count_1h, count_6h, count_24h, count_7d = counts_by_ticker.get(
+                        ticker, no_counts
+                    )
+                    sentiment_data = sentiment_by_ticker.get(ticker, _EMPTY_SENTIMENT_STATS)
+
+                    historical_data.append(
+                        CompanyFeatures(
+                            ticker=ticker,
+                            count_1h=count_1h,
+                            count_6h=count_6h,
+                            count_24h=count_24h,
+                            count_7d=count_7d,
+                            sentiment_mean=sentiment_data["mean"],
+                            sentiment_std=sentiment_data["std"],
+                            sentiment_mean_24h=sentiment_data["mean_24h"],
+                            sentiment_std_24h=sentiment_data["std_24h"],
+                            had_alert=ticker in alerted_tickers,
+                        )
+                    )
 
         except Exception as e:
             logger.error("Failed to fetch historical data", extra={"error": str(e)})
 
         return historical_data
 
-    def _get_sentiment_stats(self, conn, ticker: str) -> dict[str, float]:
-        """Get sentiment statistics for a company."""
+    def _get_sentiment_stats_by_company(self, conn) -> dict[str, dict[str, float]]:
+        """Get sentiment statistics for every company with recent scored articles."""
         try:
-            # Get sentiment scores from articles mentioning this company
+            # Mean and mean of squares over 7 days and over the last day, in one
+            # pass; the variance is E[x^2] - E[x]^2
             rows = conn.execute(
                 """
-                SELECT a.sentiment_score
+                SELECT
+                    cm.company_ticker AS ticker,
+                    AVG(a.sentiment_score) AS mean,
+                    AVG(a.sentiment_score * a.sentiment_score) AS mean_sq,
+                    COUNT(CASE WHEN a.published_at > :since_24h
+                               THEN 1 END) AS n_24h,
+                    AVG(CASE WHEN a.published_at > :since_24h
+                             THEN a.sentiment_score END) AS mean_24h,
+                    AVG(CASE WHEN a.published_at > :since_24h
+                             THEN a.sentiment_score * a.sentiment_score END) AS mean_sq_24h
                 FROM articles a
                 JOIN company_mentions cm ON a.id = cm.article_id
-                WHERE cm.company_ticker = ?
-                AND a.sentiment_score IS NOT NULL
-                AND a.published_at > datetime('now', '-7 days')
+                WHERE a.sentiment_score IS NOT NULL
+                AND a.published_at > :since_7d
+                GROUP BY cm.company_ticker
                 """,
-                (ticker,),
+                {"since_24h": _utc_cutoff(days=1), "since_7d": _utc_cutoff(days=7)},
             ).fetchall()
+        except Exception:
+            return {}
 
-            if not rows:
-                return {"mean": 0, "std": 0, "mean_24h": 0, "std_24h": 0}
-
-            scores = [row["sentiment_score"] for row in rows]
-            mean = sum(scores) / len(scores)
-            std = (sum((s - mean) ** 2 for s in scores) / len(scores)) ** 0.5
+        stats = {}
+        for row in rows:
+            mean = row["mean"]
+            # Clamp rounding error that can push a zero variance slightly negative
+            std = max(row["mean_sq"] - mean * mean, 0.0) ** 0.5
 
-            # Get 24h stats
-            rows_24h = conn.execute(
-                """
-                SELECT a.sentiment_score
-                FROM articles a
-                JOIN company_mentions cm ON a.id = cm.article_id
-                WHERE cm.company_ticker = ?
-                AND a.sentiment_score IS NOT NULL
-                AND a.published_at > datetime('now', '-1 day')
-                """,
-                (ticker,),
-            ).fetchall()
-
-            if rows_24h:
-                scores_24h = [row["sentiment_score"] for row in rows_24h]
-                mean_24h = sum(scores_24h) / len(scores_24h)
-                std_24h = (sum((s - mean_24h) ** 2 for s in scores_24h) / len(scores_24h)) ** 0.5
+            if row["n_24h"]:
+                mean_24h = row["mean_24h"]
+                std_24h = max(row["mean_sq_24h"] - mean_24h * mean_24h, 0.0) ** 0.5
             else:
                 mean_24h = mean
                 std_24h = std
 
-            return {"mean": mean, "std": std, "mean_24h": mean_24h, "std_24h": std_24h}
-
-        except Exception:
-            return {"mean": 0, "std": 0, "mean_24h": 0, "std_24h": 0}
+            stats[row["ticker"]] = {
+                "mean": mean,
+                "std": std,
+                "mean_24h": mean_24h,
+                "std_24h": std_24h,
+            }
+        return stats
 
-    def _check_for_recent_alert(self, conn, ticker: str) -> bool:
-        """Check if there was a recent alert for this company."""
+    def _get_recently_alerted_tickers(self, conn) -> set[str]:
+        """Get the companies that had an alert in the last 7 days."""
         try:
-            row = conn.execute(
+            rows = conn.execute(
                 """
-                SELECT COUNT(*) as count
+                SELECT DISTINCT company_ticker
                 FROM alerts
-                WHERE company_ticker = ?
-                AND created_at > datetime('now', '-7 days')
+                WHERE created_at > ?
                 """,
-                (ticker,),
-            ).fetchone()
+                (_utc_cutoff(days=7),),
+            ).fetchall()
 
-            return row["count"] > 0 if row else False
+            return {row["company_ticker"] for row in rows}
 
         except Exception:
-            return False
+            return set()
@@ -7,8 +7,13 @@ for enhanced pattern recognition.
 
 import json
 import logging
+import math
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
@@ -33,8 +38,86 @@ except ImportError:
     YFINANCE_AVAILABLE = False
     logger.debug("Market data provider not available")
 
+# Daily article counts for a company with no mentions in the last week
+_NO_DAILY_COUNTS = [0] * 7
 
-@dataclass
+# Most articles whose sentiment or keywords are kept between runs; the oldest
+# analysed are dropped first
+_ARTICLE_CACHE_SIZE = 50_000
+
+# The article columns the detectors read
+_ARTICLE_FIELDS = ("id", "content", "published_at", "sentiment_score")
+
+# Articles mentioning a company published after a time
+_SQL_WINDOW = f"""
+    SELECT {", ".join(f"a.{column}" for column in _ARTICLE_FIELDS)} FROM articles a
+    JOIN company_mentions cm ON a.id = cm.article_id
+    WHERE cm.company_ticker = ?
+    AND a.published_at > ?
+    ORDER BY a.published_at DESC
+"""
+
+# Articles mentioning a company published between two times
+_SQL_EXCLUDE = f"""
+    SELECT {", ".join(f"a.{column}" for column in _ARTICLE_FIELDS)} FROM articles a
+    JOIN company_mentions cm ON a.id = cm.article_id
+    WHERE cm.company_ticker = ?
+    AND a.published_at BETWEEN ? AND ?
+    ORDER BY a.published_at DESC
+"""
+
+# Windows of at least this many articles have their sentiment mean and std
+# taken with numpy; below it, building the array costs more than the one-pass
+# Python loop saves
+_NUMPY_STATS_MIN_ARTICLES = 256
+
+# Default words reported as the keywords of a negative news cluster, in
+# reporting order; overridden by the negative_cluster_keywords setting
+_NEGATIVE_KEYWORDS = (
+    "investigation",
+    "lawsuit",
+    "layoffs",
+    "bankruptcy",
+    "crash",
+    "plunge",
+    "scandal",
+    "fraud",
+)
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """
+    Match any keyword anywhere in lowercased text, as substrings like the
+    per-word ``in`` checks it replaces, in one pass however many there are.
+
+    Longer keywords are tried first. Matches don't overlap, so a keyword
+    only ever seen inside a longer one's match isn't reported; none of the
+    defaults overlap.
+    """
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+
+def _mean_std(values: Iterable[float]) -> tuple[float, float]:
+    """
+    Mean and population standard deviation in one pass (Welford's method).
+
+    Accepts any iterable, so scores can be streamed without building a list.
+    Returns 0 for no values and std 0 for a single value.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for v in values:
+        n += 1
+        delta = v - mean
+        mean += delta / n
+        m2 += delta * (v - mean)
+    if n == 0:
+        return 0, 0
+    return mean, math.sqrt(m2 / n) if n > 1 else 0
+
+
+@dataclass(slots=True)
 class PatternAlert:
     pattern_type: str  # 'volume_spike', 'sentiment_shift', 'negative_cluster', 'momentum'
     ticker: str
@@ -44,6 +127,7 @@ class PatternAlert:
     details: dict[str, Any]
     ml_score: float | None = None  # ML confidence score when ML detection is used
     market_context: dict[str, Any] | None = None  # Stock price context when available
+    timestamp: datetime = field(default_factory=datetime.now)  # When the alert was raised
 
     def to_dict(self) -> dict[str, Any]:
         result = {
@@ -53,7 +137,7 @@ class PatternAlert:
             "severity": self.severity,
             "message": self.message,
             "details": self.details,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.timestamp.isoformat(),
         }
         if self.ml_score is not None:
             result["ml_score"] = self.ml_score
@@ -75,6 +159,14 @@ class PatternDetector:
         self.min_articles_for_alert = config.get("min_articles_for_alert", 3)
         self.sentiment_threshold = 0.5
 
+        # Negative cluster keywords, matched with one compiled pattern
+        self.negative_keywords = tuple(
+            dict.fromkeys(
+                word.lower() for word in config.get("negative_cluster_keywords", _NEGATIVE_KEYWORDS)
+            )
+        )
+        self._negative_keyword_pattern = _keyword_pattern(self.negative_keywords)
+
         # Sentiment analyzer
         sentiment_config = config.get("sentiment_keywords", {})
         self.sentiment_analyzer = SentimentAnalyzer(
@@ -82,6 +174,25 @@ class PatternDetector:
             negative_words=sentiment_config.get("negative", []),
         )
 
+        # Reference time of the current detect_all_patterns run, ending every window
+        self._run_now: datetime | None = None
+        # Articles for the companies of the current detect_all_patterns run,
+        # fetched once and narrowed per window by _get_company_articles
+        self._articles_by_ticker: dict[str, list[dict]] | None = None
+        # Start of each window of the current run, by hours before _run_now, as
+        # the string sqlite3 binds datetimes as
+        self._cutoffs: dict[int, str] = {}
+        # Each prefetched company's published_at values, oldest first, for bisecting
+        self._article_times: dict[str, list[str]] = {}
+        # Sentiment of articles scored by the detectors, by article id, kept
+        # across runs as an article's content doesn't change
+        self._sentiment_cache: dict[int, float] = {}
+        # Negative keywords found in articles, by article id, likewise kept
+        self._keyword_cache: dict[int, frozenset[str]] = {}
+        # Article count, sentiment mean and std by (ticker, hours, exclude_hours)
+        # during the current run, shared by the ML features and sentiment shift
+        self._stats_cache: dict[tuple[str, int, int], tuple[int, float, float]] = {}
+
         # ML detection (optional)
         self.ml_detector: Any | None = None
         self.ml_enabled = False
@@ -108,7 +219,7 @@ class PatternDetector:
         market_config = config.get("market_data", {})
         if market_config.get("enabled", False) and MarketDataProvider is not None:
             try:
-                self.market_data = MarketDataProvider(market_config)
+                self.market_data = MarketDataProvider(market_config, db=self.db)
                 self.market_data_enabled = self.market_data.enabled
                 self.include_market_in_alerts = market_config.get("include_in_alerts", True)
                 logger.info(
@@ -122,107 +233,216 @@ class PatternDetector:
 
     def detect_all_patterns(self) -> list[PatternAlert]:
         """Run all pattern detection algorithms"""
-        alerts = []
+        alerts = list(self.iter_patterns())
+        logger.info(f"Pattern detection found {len(alerts)} alerts")
+        return alerts
+
+    def iter_patterns(self) -> Iterator[PatternAlert]:
+        """
+        Run all pattern detection algorithms, yielding alerts as they are found.
 
-        # Get company mention stats
+        Each company's alerts are yielded once its detectors have run, so a
+        consumer can start on them before the rest of the companies are
+        checked. The run's state is released when the iterator is exhausted
+        or closed.
+        """
+        # Get company mention stats, keeping the companies with enough mentions
         company_counts = self.db.get_mention_counts(hours=self.windows["long"])
+        companies = [
+            company for company in company_counts if company["count"] >= self.min_articles_for_alert
+        ]
+        tickers = [company["company_ticker"] for company in companies]
+
+        # Article counts for every window, and the articles behind the sentiment
+        # detectors, fetched for all companies up front rather than per company.
+        # The count queries and the market data download are independent of the
+        # prefetch; sqlite3 and the download release the GIL while they wait, so
+        # they run alongside it, on per-thread connections, and the download
+        # carries on through sentiment and ML scoring until its results are read
+        self._run_now = datetime.now()
+        try:
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                market_future = pool.submit(self._get_market_contexts, tickers)
+                counts_future = pool.submit(self._get_window_counts, tickers)
+                daily_future = pool.submit(
+                    lambda: (
+                        self.db.get_daily_counts(days=7, tickers=tickers, now=self._run_now)
+                        if tickers
+                        else {}
+                    )
+                )
+                self._prefetch_articles(tickers)
+                window_counts = counts_future.result()
+                daily_counts = daily_future.result()
+
+                self._score_prefetched_articles()
+                yield from self._iter_company_alerts(
+                    companies, window_counts, daily_counts, market_future
+                )
+        finally:
+            self._run_now = None
+            self._articles_by_ticker = None
+            self._cutoffs.clear()
+            self._article_times.clear()
+            self._trim_article_caches()
+            self._stats_cache.clear()
+
+    def _iter_company_alerts(
+        self,
+        companies: list[dict[str, Any]],
+        window_counts: dict[str, dict[int, int]],
+        daily_counts: dict[str, list[int]],
+        market_future: Future,
+    ) -> Iterator[PatternAlert]:
+        """
+        Run the detection algorithms over each company, yielding its alerts.
 
-        for company in company_counts:
+        Args:
+            market_future: Resolves to _get_market_contexts for the companies
+        """
+        alerts = []
+
+        # Score every company with the ML models in one batch
+        ml_results: dict[str, dict[str, Any]] = {}
+        if self.ml_enabled and self.ml_detector and self.ml_detector.is_trained:
+            tickers = [company["company_ticker"] for company in companies]
+            scores = self.ml_detector.get_ml_score_batch(
+                [
+                    self._prepare_company_data_for_ml(ticker, window_counts[ticker])
+                    for ticker in tickers
+                ]
+            )
+            ml_results = dict(zip(tickers, scores))
+
+        market_contexts = market_future.result()
+
+        # The current company's ML result and market context, set in the loop
+        # below and read by emit
+        ml_result: dict[str, Any] | None = None
+        market_context: dict[str, Any] | None = None
+
+        def emit(alert: PatternAlert | None) -> bool:
+            """Enrich an alert with the current company's ML score and market context."""
+            if alert is None:
+                return False
+            if ml_result:
+                alert = self._apply_ml_score(alert, ml_result)
+            if market_context:
+                alert = self._apply_market_context(alert, market_context)
+            alerts.append(alert)
+            return True
+
+        for company in companies:
             ticker = company["company_ticker"]
             company_name = company["company_name"]
+            counts = window_counts[ticker]
+
+            # ML score for this company, if ML detection is enabled
+            ml_result = ml_results.get(ticker)
+
+            # Market context, if enabled
+            market_context = market_contexts.get(ticker)
 
-            # Skip if not enough mentions
-            if company["count"] < self.min_articles_for_alert:
-                continue
-
-            # Get ML score for this company if ML detection is enabled
-            ml_result = None
-            if self.ml_enabled and self.ml_detector and self.ml_detector.is_trained:
-                company_data = self._prepare_company_data_for_ml(ticker)
-                ml_result = self.ml_detector.get_ml_score(company_data)
-
-            # Get market context if enabled
-            market_context = None
-            if (
-                self.market_data_enabled
-                and self.market_data
-                and getattr(self, "include_market_in_alerts", True)
-            ):
-                market_context = self._get_market_context(ticker)
-
-            # Run detection algorithms
-            volume_alert = self._detect_volume_spike(ticker, company_name)
-            if volume_alert:
-                volume_alert = self._apply_ml_score(volume_alert, ml_result)
-                volume_alert = self._apply_market_context(volume_alert, market_context)
-                alerts.append(volume_alert)
-
-            sentiment_alert = self._detect_sentiment_shift(ticker, company_name)
-            if sentiment_alert:
-                sentiment_alert = self._apply_ml_score(sentiment_alert, ml_result)
-                sentiment_alert = self._apply_market_context(sentiment_alert, market_context)
-                alerts.append(sentiment_alert)
-
-            momentum_alert = self._detect_momentum_building(ticker, company_name)
-            if momentum_alert:
-                momentum_alert = self._apply_ml_score(momentum_alert, ml_result)
-                momentum_alert = self._apply_market_context(momentum_alert, market_context)
-                alerts.append(momentum_alert)
-
-            negative_alert = self._detect_negative_cluster(ticker, company_name)
-            if negative_alert:
-                negative_alert = self._apply_ml_score(negative_alert, ml_result)
-                negative_alert = self._apply_market_context(negative_alert, market_context)
-                alerts.append(negative_alert)
+            # Run detection algorithms, the count-based ones first, tracking
+            # whether a rule-based detector fired for this company
+            had_alert = emit(self._detect_volume_spike(ticker, company_name, counts))
+            had_alert |= emit(
+                self._detect_momentum_building(
+                    ticker, company_name, daily_counts.get(ticker, _NO_DAILY_COUNTS)
+                )
+            )
+
+            # The article-based detectors can't fire without articles, so skip
+            # their window slicing and scoring for companies with none this week
+            if self._has_articles(ticker):
+                had_alert |= emit(self._detect_sentiment_shift(ticker, company_name))
+                had_alert |= emit(self._detect_negative_cluster(ticker, company_name))
 
             # Check for ML-only anomalies (patterns rule-based might miss)
-            if ml_result and not any(
-                a.ticker == ticker
-                for a in [volume_alert, sentiment_alert, momentum_alert, negative_alert]
-                if a
-            ):
+            if ml_result and not had_alert:
                 ml_alert = self._check_ml_only_anomaly(ticker, company_name, ml_result)
                 if ml_alert:
                     ml_alert = self._apply_market_context(ml_alert, market_context)
                     alerts.append(ml_alert)
 
-        logger.info(f"Pattern detection found {len(alerts)} alerts")
-        return alerts
+            yield from alerts
+            alerts.clear()
 
-    def _prepare_company_data_for_ml(self, ticker: str) -> dict[str, Any]:
-        """Prepare company data dictionary for ML feature extraction."""
-        count_1h = self.db.get_article_count_for_company(ticker, hours=1)
-        count_6h = self.db.get_article_count_for_company(ticker, hours=6)
-        count_24h = self.db.get_article_count_for_company(ticker, hours=24)
-        count_7d = self.db.get_article_count_for_company(ticker, hours=168)
+    def _count_window_hours(self) -> tuple[int, ...]:
+        """Every window, in hours, that the detectors read article counts for."""
+        # The ML features' fixed windows, and the configured ones
+        return tuple(sorted({1, 6, 24, 168, *self.windows.values()}))
 
-        # Get sentiment stats from recent articles
-        recent_articles = self._get_company_articles(ticker, hours=24)
-        sentiments = [
-            self.sentiment_analyzer.analyze(a.get("content", "")) for a in recent_articles
-        ]
+    def _get_window_counts(self, tickers: list[str]) -> dict[str, dict[int, int]]:
+        """
+        Article counts for each company over every _count_window_hours window.
 
-        sentiment_mean = sum(sentiments) / len(sentiments) if sentiments else 0
-        sentiment_std = (
-            (sum((s - sentiment_mean) ** 2 for s in sentiments) / len(sentiments)) ** 0.5
-            if len(sentiments) > 1
-            else 0
+        Returns:
+            Counts by window length in hours, by ticker
+        """
+        if not tickers:
+            return {}
+
+        hours = self._count_window_hours()
+        counts = self.db.get_article_counts_by_company(hours, tickers, now=self._run_now)
+        no_counts = [0] * len(hours)
+        return {ticker: dict(zip(hours, counts.get(ticker, no_counts))) for ticker in tickers}
+
+    def _prefetch_articles(self, tickers: list[str]):
+        """Fetch the articles for every window the detectors read, for all companies."""
+        # The widest window is the week of older articles the ML features compare against
+        hours = max(48, 168, *self.windows.values())
+        # Set by detect_all_patterns; defaulted here for a standalone prefetch
+        if self._run_now is None:
+            self._run_now = datetime.now()
+        self._cutoffs.clear()
+        self._article_times.clear()
+        self._articles_by_ticker = self.db.get_articles_for_companies(
+            tickers, self._run_now - timedelta(hours=hours), columns=_ARTICLE_FIELDS
         )
 
-        # Get older sentiment for comparison
-        older_articles = self._get_company_articles(ticker, hours=168, exclude_hours=24)
-        older_sentiments = [
-            self.sentiment_analyzer.analyze(a.get("content", "")) for a in older_articles
-        ]
-        sentiment_mean_24h = (
-            sum(older_sentiments) / len(older_sentiments) if older_sentiments else sentiment_mean
-        )
-        sentiment_std_24h = (
-            (sum((s - sentiment_mean_24h) ** 2 for s in older_sentiments) / len(older_sentiments))
-            ** 0.5
-            if len(older_sentiments) > 1
-            else sentiment_std
+    def _score_prefetched_articles(self):
+        """
+        Score every prefetched article a detector will read, in one batch.
+
+        An article mentioning several companies appears in each of their
+        prefetched lists but is scored once. Only articles new enough for the
+        sentiment windows are scored, or for the ML features' week when ML
+        scoring runs.
+        """
+        if self.ml_enabled and self.ml_detector and self.ml_detector.is_trained:
+            hours = max(168, *self.windows.values())
+        else:
+            hours = max(48, self.windows["short"], self.windows["medium"])
+        cutoff = self._cutoff(hours)
+
+        unscored: dict[int, dict] = {}
+        for articles in self._articles_by_ticker.values():
+            # Newest first, so stop at the first article past the horizon
+            for article in articles:
+                if article["published_at"] < cutoff:
+                    break
+                if article.get("sentiment_score") is None:
+                    unscored.setdefault(article["id"], article)
+        if unscored:
+            self._article_sentiments(list(unscored.values()))
+
+    def _prepare_company_data_for_ml(self, ticker: str, counts: dict[int, int]) -> dict[str, Any]:
+        """Prepare company data dictionary for ML feature extraction."""
+        count_1h = counts[1]
+        count_6h = counts[6]
+        count_24h = counts[24]
+        count_7d = counts[168]
+
+        # Get sentiment stats from recent articles
+        _, sentiment_mean, sentiment_std = self._sentiment_stats(ticker, hours=24)
+
+        # Get older sentiment for comparison, falling back to the recent stats
+        older_count, older_mean, older_std = self._sentiment_stats(
+            ticker, hours=168, exclude_hours=24
         )
+        sentiment_mean_24h = older_mean if older_count else sentiment_mean
+        sentiment_std_24h = older_std if older_count > 1 else sentiment_std
 
         return {
             "ticker": ticker,
@@ -310,12 +530,14 @@ class PatternDetector:
 
         return self.ml_detector.auto_train_if_ready(self.db, force=force)
 
-    def _detect_volume_spike(self, ticker: str, company_name: str) -> PatternAlert | None:
+    def _detect_volume_spike(
+        self, ticker: str, company_name: str, counts: dict[int, int]
+    ) -> PatternAlert | None:
         """Detect unusual volume of articles (spike in coverage)"""
-        # Get counts for different time windows
-        count_6h = self.db.get_article_count_for_company(ticker, hours=self.windows["short"])
-        count_24h = self.db.get_article_count_for_company(ticker, hours=self.windows["medium"])
-        count_7d = self.db.get_article_count_for_company(ticker, hours=self.windows["long"])
+        # Counts for different time windows
+        count_6h = counts[self.windows["short"]]
+        count_24h = counts[self.windows["medium"]]
+        count_7d = counts[self.windows["long"]]
 
         # Calculate 7-day average per day
         avg_daily = count_7d / 7.0
@@ -368,27 +590,18 @@ class PatternDetector:
 
     def _detect_sentiment_shift(self, ticker: str, company_name: str) -> PatternAlert | None:
         """Detect significant sentiment changes"""
-        # Get recent articles mentioning this company
-        recent_articles = self._get_company_articles(ticker, hours=self.windows["medium"])
+        # Sentiment of recent articles mentioning this company
+        recent_count, avg_sentiment, _ = self._sentiment_stats(ticker, hours=self.windows["medium"])
 
-        if len(recent_articles) < 3:
+        if recent_count < 3:
             return None
 
-        # Analyze sentiment of each article
-        sentiments = [self.sentiment_analyzer.analyze(a["content"]) for a in recent_articles]
-        avg_sentiment = sum(sentiments) / len(sentiments)
-
         # Get older baseline (24-48h ago)
-        older_articles = self._get_company_articles(
+        older_count, baseline, _ = self._sentiment_stats(
             ticker, hours=48, exclude_hours=self.windows["medium"]
         )
 
-        if older_articles:
-            older_sentiments = [
-                self.sentiment_analyzer.analyze(a["content"]) for a in older_articles
-            ]
-            baseline = sum(older_sentiments) / len(older_sentiments)
-
+        if older_count:
             # Detect significant shift
             shift = avg_sentiment - baseline
 
@@ -408,7 +621,7 @@ class PatternDetector:
                         "shift": round(shift, 3),
                         "current_sentiment": round(avg_sentiment, 3),
                         "baseline_sentiment": round(baseline, 3),
-                        "article_count": len(recent_articles),
+                        "article_count": recent_count,
                     },
                 )
 
@@ -424,7 +637,7 @@ class PatternDetector:
                 details={
                     "direction": "positive",
                     "current_sentiment": round(avg_sentiment, 3),
-                    "article_count": len(recent_articles),
+                    "article_count": recent_count,
                 },
             )
         elif avg_sentiment <= -0.6:
@@ -438,43 +651,38 @@ class PatternDetector:
                 details={
                     "direction": "negative",
                     "current_sentiment": round(avg_sentiment, 3),
-                    "article_count": len(recent_articles),
+                    "article_count": recent_count,
                 },
             )
 
         return None
 
-    def _detect_momentum_building(self, ticker: str, company_name: str) -> PatternAlert | None:
-        """Detect increasing coverage momentum"""
-        # Get counts for successive time windows
-        counts = []
-        for i in range(7):  # Last 7 days
-            hours_ago = (i + 1) * 24
-            count = self.db.get_article_count_for_company(ticker, hours=hours_ago)
-            # Subtract previous day's count to get daily
-            if i > 0:
-                daily = count - counts[-1]["cumulative"]
-            else:
-                daily = count
-            counts.append({"day": i, "daily": daily, "cumulative": count})
+    def _detect_momentum_building(
+        self, ticker: str, company_name: str, daily_counts: list[int]
+    ) -> PatternAlert | None:
+        """
+        Detect increasing coverage momentum
 
+        Args:
+            daily_counts: Articles per day over the last week, newest first
+        """
         # Check for increasing trend
-        daily_counts = [c["daily"] for c in counts]
-
         if len(daily_counts) >= 3:
-            # Check if last 3 days show increasing pattern
-            recent = daily_counts[:3]
-            if recent[0] > recent[1] > recent[2] and recent[0] >= 2:
+            # Check if last 3 days show increasing pattern, reading the counts
+            # in place since most companies fail the first comparison
+            today = daily_counts[0]
+            if today >= 2 and today > daily_counts[1] > daily_counts[2]:
+                yesterday, before = daily_counts[1], daily_counts[2]
                 return PatternAlert(
                     pattern_type="momentum",
                     ticker=ticker,
                     company_name=company_name,
                     severity="medium",
                     message=f"{company_name} ({ticker}): Building momentum "
-                    f"({recent[2]} → {recent[1]} → {recent[0]} articles/day)",
+                    f"({before} → {yesterday} → {today} articles/day)",
                     details={
-                        "daily_trend": recent[::-1],  # Oldest to newest
-                        "total_7d": counts[0]["cumulative"],
+                        "daily_trend": [before, yesterday, today],  # Oldest to newest
+                        "total_7d": sum(daily_counts),
                     },
                 )
 
@@ -491,24 +699,15 @@ class PatternDetector:
         negative_count = 0
         negative_keywords = []
 
-        for article in recent_articles:
-            content = article.get("content", "").lower()
-            sentiment = self.sentiment_analyzer.analyze(content)
+        sentiments = self._article_sentiments(recent_articles)
 
+        for article, sentiment in zip(recent_articles, sentiments):
             if sentiment < -0.3:
                 negative_count += 1
                 # Extract negative keywords
-                for word in [
-                    "investigation",
-                    "lawsuit",
-                    "layoffs",
-                    "bankruptcy",
-                    "crash",
-                    "plunge",
-                    "scandal",
-                    "fraud",
-                ]:
-                    if word in content and word not in negative_keywords:
+                found = self._article_keywords(article)
+                for word in self.negative_keywords:
+                    if word in found and word not in negative_keywords:
                         negative_keywords.append(word)
 
         # If majority of recent articles are negative
@@ -529,40 +728,171 @@ class PatternDetector:
 
         return None
 
+    def _trim_article_caches(self):
+        """Bound the per-article caches between runs, dropping the oldest entries."""
+        # Articles without an id share one sentiment entry, so it can't outlive the run
+        self._sentiment_cache.pop(None, None)
+        for cache in (self._sentiment_cache, self._keyword_cache):
+            overflow = len(cache) - _ARTICLE_CACHE_SIZE
+            if overflow > 0:
+                for article_id in list(islice(cache, overflow)):
+                    del cache[article_id]
+
+    def _article_sentiments(self, articles: list[dict]) -> Iterator[float]:
+        """
+        Sentiment score of each article, scoring each article at most once.
+
+        Uses the score saved with the article at ingest when there is one.
+        Otherwise the content is scored, in one batch for all unscored
+        articles, and remembered by article id, since the same article is
+        read by several detectors and companies in a run, and again by the
+        runs that follow while it stays in the window.
+        Scoring happens up front; the scores are then yielded lazily in
+        article order.
+        """
+        cache = self._sentiment_cache
+        unscored = [
+            a for a in articles if a.get("sentiment_score") is None and a.get("id") not in cache
+        ]
+        if unscored:
+            scores = self.sentiment_analyzer.analyze_many(
+                [a.get("content") or "" for a in unscored]
+            )
+            for article, score in zip(unscored, scores):
+                cache[article.get("id")] = score
+
+        return (
+            a["sentiment_score"] if a.get("sentiment_score") is not None else cache[a.get("id")]
+            for a in articles
+        )
+
+    def _article_keywords(self, article: dict) -> frozenset[str]:
+        """
+        Negative keywords in an article's content, found at most once.
+
+        An article mentioning several companies is read by the negative
+        cluster check of each, and again by later runs while it stays recent,
+        so the lowercased copy and scan are made once and kept by article id.
+        """
+        article_id = article.get("id")
+        found = self._keyword_cache.get(article_id)
+        if found is None:
+            found = frozenset(
+                self._negative_keyword_pattern.findall((article.get("content") or "").lower())
+            )
+            if article_id is not None:
+                self._keyword_cache[article_id] = found
+        return found
+
+    def _sentiment_stats(
+        self, ticker: str, hours: int, exclude_hours: int = 0
+    ) -> tuple[int, float, float]:
+        """
+        Article count, sentiment mean and sentiment std for a company's window.
+
+        During a run the result is kept, as the ML features and the sentiment
+        shift detector both read the last day's sentiment.
+        """
+        key = (ticker, hours, exclude_hours)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            articles = self._get_company_articles(ticker, hours, exclude_hours)
+            sentiments = self._article_sentiments(articles)
+            if len(articles) >= _NUMPY_STATS_MIN_ARTICLES:
+                import numpy as np
+
+                scores = np.fromiter(sentiments, dtype=float, count=len(articles))
+                stats = (len(articles), float(scores.mean()), float(scores.std()))
+            else:
+                stats = (len(articles), *_mean_std(sentiments))
+            if self._articles_by_ticker is not None:
+                self._stats_cache[key] = stats
+        return stats
+
+    def _has_articles(self, ticker: str) -> bool:
+        """
+        Whether the company may have articles in any detector window.
+
+        False only during a run, for a company with nothing in the prefetch,
+        which spans every window the detectors read.
+        """
+        return self._articles_by_ticker is None or bool(self._articles_by_ticker.get(ticker))
+
     def _get_company_articles(self, ticker: str, hours: int, exclude_hours: int = 0) -> list[dict]:
         """Get articles mentioning a company in time window"""
-        from datetime import datetime
+        if self._articles_by_ticker is not None:
+            return self._slice_prefetched_articles(ticker, hours, exclude_hours)
 
+        now = self._run_now or datetime.now()
         with self.db.get_connection() as conn:
+            # Plain tuples, zipped with the selected columns, rather than sqlite3.Row
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            # Bounds are bound as the text published_at is stored as, rather than
+            # as datetimes for sqlite3's adapter to convert
             if exclude_hours > 0:
                 # Get articles between (now - exclude_hours) and (now - hours)
-                start_time = datetime.now() - timedelta(hours=exclude_hours)
-                end_time = datetime.now() - timedelta(hours=hours)
-                rows = conn.execute(
-                    """
-                    SELECT a.* FROM articles a
-                    JOIN company_mentions cm ON a.id = cm.article_id
-                    WHERE cm.company_ticker = ?
-                    AND a.published_at BETWEEN ? AND ?
-                    ORDER BY a.published_at DESC
-                    """,
-                    (ticker, end_time, start_time),
-                ).fetchall()
+                start_time = (now - timedelta(hours=exclude_hours)).isoformat(" ")
+                end_time = (now - timedelta(hours=hours)).isoformat(" ")
+                rows = cursor.execute(_SQL_EXCLUDE, (ticker, end_time, start_time)).fetchall()
             else:
                 # Get articles from last N hours
-                since = datetime.now() - timedelta(hours=hours)
-                rows = conn.execute(
-                    """
-                    SELECT a.* FROM articles a
-                    JOIN company_mentions cm ON a.id = cm.article_id
-                    WHERE cm.company_ticker = ?
-                    AND a.published_at > ?
-                    ORDER BY a.published_at DESC
-                    """,
-                    (ticker, since),
-                ).fetchall()
-
-            return [dict(row) for row in rows]
+                since = (now - timedelta(hours=hours)).isoformat(" ")
+                rows = cursor.execute(_SQL_WINDOW, (ticker, since)).fetchall()
+
+            return [dict(zip(_ARTICLE_FIELDS, row)) for row in rows]
+
+    def _slice_prefetched_articles(self, ticker: str, hours: int, exclude_hours: int) -> list[dict]:
+        """
+        The prefetched articles of one company that fall in a time window.
+
+        Applies the same bounds as the queries in _get_company_articles. The
+        bounds are compared as the strings sqlite3 binds datetimes as, so the
+        comparison against the stored published_at text matches SQLite's. The
+        prefetch is sorted newest first, so each window is one contiguous
+        slice, found by bisecting the publication times.
+        """
+        articles = self._articles_by_ticker.get(ticker, [])
+        times = self._article_times.get(ticker)
+        if times is None:
+            times = self._article_times[ticker] = [a["published_at"] for a in reversed(articles)]
+
+        n = len(articles)
+        end_time = self._cutoff(hours)
+        if exclude_hours > 0:
+            start_time = self._cutoff(exclude_hours)
+            newer = bisect_right(times, start_time)
+            older = bisect_left(times, end_time)
+            return articles[n - newer : n - older]
+        return articles[: n - bisect_right(times, end_time)]
+
+    def _cutoff(self, hours: int) -> str:
+        """Start of a window ending at the run's reference time, made once per run."""
+        cutoff = self._cutoffs.get(hours)
+        if cutoff is None:
+            cutoff = self._cutoffs[hours] = (self._run_now - timedelta(hours=hours)).isoformat(" ")
+        return cutoff
+
+    def _get_market_contexts(self, tickers: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Market context for each company, when alerts include it.
+
+        Fetched for all companies with one batched market data download
+        instead of separate requests per company.
+        """
+        if (
+            not tickers
+            or not self.market_data_enabled
+            or not self.market_data
+            or not getattr(self, "include_market_in_alerts", True)
+        ):
+            return {}
+
+        try:
+            return self.market_data.get_market_context_bulk(tickers)
+        except Exception as e:
+            logger.debug(f"Failed to get market context for {len(tickers)} tickers: {e}")
+            return {}
 
     def _get_market_context(self, ticker: str) -> dict[str, Any] | None:
         """
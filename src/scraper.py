@@ -3,6 +3,7 @@ News scraper module for Reuters, Bloomberg, and other sources
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import (
     RequestException,
     Timeout,
@@ -16,16 +17,26 @@ import random
 import json
 import os
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import yaml
+import asyncio
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from pathlib import Path
 
 from logging_config import get_logger
+from rss_parser import parse_feed
+
+try:
+    from async_scraper import AsyncScraperManager
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 # Default timeout for HTTP requests (seconds)
 DEFAULT_REQUEST_TIMEOUT = 30
@@ -33,6 +44,12 @@ DEFAULT_REQUEST_TIMEOUT = 30
 # Thread-local storage for sessions
 _thread_local = threading.local()
 
+# Connection pools of the shared HTTP session: how many hosts keep a pool, and
+# how many keep-alive connections each pool holds, enough for every scraper
+# thread to fetch from one host at once
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
 logger = get_logger(__name__)
 
 
@@ -127,6 +144,34 @@ def init_domain_rate_limiter(config: dict[str, Any]) -> DomainRateLimiter:
     return _domain_rate_limiter
 
 
+# Global HTTP session shared by every scraper (created on first use)
+_shared_session: requests.Session | None = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the HTTP session shared by every scraper, creating it on first use.
+
+    Scrapers of feeds on the same host reuse its keep-alive connections
+    instead of each opening their own, saving a TCP and TLS handshake per
+    fetch. Scrapers send their own headers with each request, so the session
+    itself carries none of theirs.
+    """
+    global _shared_session
+
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=0
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _shared_session = session
+        return _shared_session
+
+
 class FeedHealthTracker:
     """
     Tracks feed health and implements dead feed detection with exponential backoff.
@@ -532,25 +577,23 @@ class BaseScraper(ABC):
     def __init__(self, config: dict[str, Any], global_config: dict[str, Any]):
         self.config = config
         self.global_config = global_config
-        self.session = requests.Session()
+        self.session = get_shared_session()
         self._setup_session()
 
     def _setup_session(self):
-        """Setup requests session with headers and settings"""
+        """Choose this scraper's request headers, sent with each request on the shared session"""
         user_agents = self.global_config.get(
             "user_agents", ["Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"]
         )
 
-        self.session.headers.update(
-            {
-                "User-Agent": random.choice(user_agents),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-            }
-        )
+        self.headers = {
+            "User-Agent": random.choice(user_agents),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Connection": "keep-alive",
+        }
 
     def _get_delay(self) -> float:
         """Get random delay between requests"""
@@ -580,7 +623,7 @@ class BaseScraper(ABC):
         for attempt in range(retries):
             try:
                 logger.debug("Fetching URL", extra={"url": url})
-                response = self.session.get(url, timeout=timeout)
+                response = self.session.get(url, timeout=timeout, headers=self.headers)
                 response.raise_for_status()
                 return response.text
 
@@ -720,7 +763,7 @@ class RSSScraper(BaseScraper):
         timeout = self.global_config.get("timeout", DEFAULT_REQUEST_TIMEOUT)
 
         # Prepare headers with cache validators
-        headers = {}
+        headers = dict(self.headers)
         if cache:
             headers.update(cache.get_cache_headers(feed_url))
 
@@ -746,7 +789,7 @@ class RSSScraper(BaseScraper):
             logger.debug("Cache MISS (fetched new content)", extra={"feed_url": feed_url})
 
             # Parse the feed from content
-            feed = feedparser.parse(response.content)
+            feed = parse_feed(response.content)
             return feed, True
 
         except Timeout:
@@ -1143,8 +1186,56 @@ class ScraperManager:
 
     def scrape_all(self, max_workers: int = 10) -> list[ArticleData]:
         """Run all scrapers in parallel and return combined results"""
-        all_articles = []
+        return list(self.scrape_all_iter(max_workers))
 
+    async def scrape_all_async(
+        self, connection_limit: int = 32, per_host_limit: int = 4
+    ) -> list[ArticleData]:
+        """
+        Scrape all sources on a single event loop with aiohttp
+
+        Feed fetches are dominated by network round trips, so overlapping them
+        on one loop beats a thread per source. The connector caps total and
+        per-host connections, which throttles each domain independently of the
+        rest. Falls back to the threaded scraper when aiohttp is not installed.
+        """
+        return [
+            article
+            async for article in self.scrape_all_async_iter(connection_limit, per_host_limit)
+        ]
+
+    async def scrape_all_async_iter(
+        self, connection_limit: int = 32, per_host_limit: int = 4
+    ) -> AsyncIterator[ArticleData]:
+        """
+        Scrape all sources on a single event loop, yielding unique articles as
+        each source finishes
+
+        The streaming counterpart of scrape_all_async, for callers that process
+        articles in bounded chunks while the remaining sources are fetched.
+        Falls back to the threaded scrape_all_iter when aiohttp is not installed.
+        """
+        if not AIOHTTP_AVAILABLE:
+            stream = self.scrape_all_iter()
+            while (article := await asyncio.to_thread(next, stream, None)) is not None:
+                yield article
+            return
+
+        async with AsyncScraperManager(
+            config=self.config,
+            connection_limit=connection_limit,
+            per_host_limit=per_host_limit,
+        ) as manager:
+            async for article in manager.scrape_all_iter():
+                yield article
+
+    def scrape_all_iter(self, max_workers: int = 10) -> Iterator[ArticleData]:
+        """
+        Run all scrapers in parallel, yielding unique articles as each source finishes
+
+        Lets callers process and persist articles in bounded chunks instead of
+        holding the whole cycle's scrape in memory.
+        """
         # Reset cache statistics for this run
         if self.http_cache:
             self.http_cache.reset_stats()
@@ -1158,24 +1249,23 @@ class ScraperManager:
                 executor.submit(self._scrape_single, scraper): scraper for scraper in self.scrapers
             }
 
+            # Remove duplicates by URL as results arrive
+            seen_urls = set()
             for future in as_completed(future_to_scraper):
                 scraper = future_to_scraper[future]
                 try:
                     articles = future.result()
-                    all_articles.extend(articles)
                 except Exception as e:
                     logger.error(
                         "Scraper generated an exception",
                         extra={"source": scraper.config.get("name"), "error": str(e)},
                     )
+                    continue
 
-        # Remove duplicates by URL
-        seen_urls = set()
-        unique_articles = []
-        for article in all_articles:
-            if article.url not in seen_urls:
-                seen_urls.add(article.url)
-                unique_articles.append(article)
+                for article in articles:
+                    if article.url not in seen_urls:
+                        seen_urls.add(article.url)
+                        yield article
 
         # Log cache statistics
         if self.http_cache:
@@ -1203,8 +1293,7 @@ class ScraperManager:
                         },
                     )
 
-        logger.info("Scraping complete", extra={"unique_articles": len(unique_articles)})
-        return unique_articles
+        logger.info("Scraping complete", extra={"unique_articles": len(seen_urls)})
 
     def _cleanup_http_cache(self):
         """Clean up old HTTP cache entries"""
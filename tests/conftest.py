@@ -180,19 +180,19 @@ def positive_articles():
     now = datetime.now()
     return [
         {
-            "id": 1,
+            "id": 4,
             "content": "Company reports massive profit growth and record revenue. "
             "Analysts upgrade stock rating to strong buy.",
             "published_at": now - timedelta(hours=1),
         },
         {
-            "id": 2,
+            "id": 5,
             "content": "Stock surges on breakthrough product announcement. "
             "Investors are extremely bullish on future prospects.",
             "published_at": now - timedelta(hours=2),
         },
         {
-            "id": 3,
+            "id": 6,
             "content": "Company beats expectations with innovative new technology. "
             "Success drives positive momentum in the market.",
             "published_at": now - timedelta(hours=3),
@@ -206,13 +206,13 @@ def neutral_articles():
     now = datetime.now()
     return [
         {
-            "id": 1,
+            "id": 7,
             "content": "Company announced routine quarterly results today. "
             "The numbers were in line with expectations.",
             "published_at": now - timedelta(hours=1),
         },
         {
-            "id": 2,
+            "id": 8,
             "content": "CEO spoke at industry conference about general trends. "
             "No major announcements were made during the presentation.",
             "published_at": now - timedelta(hours=2),
@@ -48,6 +48,41 @@ class TestCompanyExtractor:
         assert "GOOGL" in tickers
         assert len(matches) == 3
 
+    def test_multiple_aliases_single_match(self, sample_watchlist):
+        """Test that several aliases of one company yield a single match."""
+        extractor = CompanyExtractor(sample_watchlist)
+
+        text = "Alphabet Inc reported earnings. Google search revenue grew, and $GOOGL rose."
+        matches = extractor.extract(text)
+
+        assert [m.ticker for m in matches] == ["GOOGL"]
+
+    def test_extract_batch_matches_extract(self, sample_watchlist):
+        """Test that batch extraction gives the same results as per-text extract."""
+        extractor = CompanyExtractor(sample_watchlist)
+
+        texts = [
+            "Apple and Microsoft led the gains.",
+            "The weather was mild today.",
+            "",
+            "Shares of $TSLA jumped after hours.",
+        ]
+        batch = extractor.extract_batch(texts)
+
+        assert len(batch) == len(texts)
+        for text, matches in zip(texts, batch):
+            assert [m.ticker for m in matches] == [m.ticker for m in extractor.extract(text)]
+        assert batch[1] == []
+
+    def test_extract_batch_sees_added_company(self, sample_watchlist):
+        """Test that batch extraction picks up companies added later."""
+        extractor = CompanyExtractor(sample_watchlist)
+        extractor.add_company("IBM", ["IBM", "International Business Machines"])
+
+        batch = extractor.extract_batch(["International Business Machines beat estimates."])
+
+        assert [m.ticker for m in batch[0]] == ["IBM"]
+
     def test_case_insensitive_matching(self, sample_watchlist):
         """Test that company matching is case insensitive."""
         extractor = CompanyExtractor(sample_watchlist)
@@ -446,6 +481,18 @@ class TestSentimentAnalyzerUnified:
         assert "negative_count" in result
         assert "neutral_count" in result
 
+    def test_analyze_many_matches_analyze(self, positive_keywords, negative_keywords):
+        """Test that batch scoring returns per-text scores in input order."""
+        analyzer = SentimentAnalyzer(
+            positive_words=positive_keywords, negative_words=negative_keywords, method="keyword"
+        )
+
+        texts = ["Growth and profit.", "Decline and loss.", "Meeting today."]
+        scores = analyzer.analyze_many(texts)
+
+        assert scores == [analyzer.analyze(t) for t in texts]
+        assert analyzer.analyze_many([]) == []
+
     def test_analyze_detailed(self, positive_keywords, negative_keywords):
         """Test detailed analysis through unified analyzer."""
         analyzer = SentimentAnalyzer(
@@ -369,6 +369,20 @@ class TestPatternsValidation:
         finally:
             Path(config_path).unlink()
 
+    def test_invalid_negative_cluster_keyword(self):
+        """Negative cluster keywords must be non-empty strings."""
+        config = self._create_config_with_patterns({"negative_cluster_keywords": ["fraud", ""]})
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            yaml.dump(config, f)
+            config_path = f.name
+
+        try:
+            result = validate_config(config_path)
+            assert not result.is_valid
+            assert "negative_cluster_keywords[1]" in str(result)
+        finally:
+            Path(config_path).unlink()
+
 
 class TestCompaniesValidation:
     """Tests for companies section validation."""
@@ -5,6 +5,8 @@ Tests MarketDataProvider price fetching, caching, and the
 CorrelationAnalyzer for news-price correlation analysis.
 """
 
+import json
+import time
 import pytest
 from unittest.mock import MagicMock, patch, PropertyMock
 from datetime import datetime, timedelta
@@ -109,6 +111,74 @@ class TestMarketDataProvider:
         result = provider._get_cached("test_key")
         assert result is None
 
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache is bounded and evicts the least recently used key."""
+        from market_data import MarketDataProvider
+
+        provider = MarketDataProvider({"enabled": False, "cache_max_entries": 2})
+
+        provider._set_cached("a", 1)
+        provider._set_cached("b", 2)
+        assert provider._get_cached("a") == 1  # "a" is now most recently used
+        provider._set_cached("c", 3)
+
+        assert provider._get_cached("b") is None
+        assert provider._get_cached("a") == 1
+        assert provider._get_cached("c") == 3
+
+    def test_clean_cache_removes_only_expired(self):
+        """Test that _clean_cache drops expired entries but keeps refreshed ones."""
+        from market_data import MarketDataProvider
+
+        provider = MarketDataProvider({"enabled": False})
+        provider.cache_ttl_seconds = 60
+
+        provider._set_cached("old", 1)
+        provider._cache["old"].created_at -= 120  # Simulate an old entry
+        provider._expiry_heap[0] = (provider._expiry_heap[0][0] - 120, "old")
+        provider._set_cached("fresh", 2)
+        provider._clean_cache()
+
+        assert "old" not in provider._cache
+        assert provider._get_cached("fresh") == 2
+
+    def test_cache_persists_across_providers(self, tmp_path):
+        """Test that cached values survive a new provider sharing the database."""
+        from database import Database
+        from market_data import MarketDataProvider
+
+        db = Database(str(tmp_path / "cache.db"))
+
+        first = MarketDataProvider({"enabled": False, "cache_ttl_minutes": 15}, db=db)
+        first._set_cached("price:AAPL:latest", 185.5)
+
+        second = MarketDataProvider({"enabled": False, "cache_ttl_minutes": 15}, db=db)
+        assert second._get_cached("price:AAPL:latest") == 185.5
+
+        # Expired entries on disk are ignored
+        second._cache.clear()
+        second.cache_ttl_seconds = 0
+        assert second._get_cached("price:AAPL:latest") is None
+
+    def test_disk_cache_stores_json_not_pickle(self, tmp_path):
+        """Test cached values are stored as JSON and pickled payloads are never loaded."""
+        import pickle
+
+        from database import Database
+        from market_data import MarketDataProvider
+
+        db = Database(str(tmp_path / "cache.db"))
+        provider = MarketDataProvider({"enabled": False, "cache_ttl_minutes": 15}, db=db)
+        provider._set_cached("history:AAPL:30", {"2025-01-15": 185.5})
+
+        payload, _ = db.get_price_cache_entry("history:AAPL:30")
+        assert json.loads(payload) == {"2025-01-15": 185.5}
+
+        db.set_price_cache_entry("price:AAPL:latest", pickle.dumps(185.5), time.time())
+        provider._cache.clear()
+        assert provider._get_cached("history:AAPL:30") == {"2025-01-15": 185.5}
+        assert provider._get_cached("price:AAPL:latest") is None
+
     def test_get_market_context_returns_none_when_disabled(self):
         """Test get_market_context returns None when disabled."""
         from market_data import MarketDataProvider
@@ -140,6 +210,59 @@ class TestMarketDataProvider:
         # Should work with mocked data
         # Note: actual result depends on mock setup
 
+    @patch("market_data.yf")
+    def test_get_market_context_bulk_batches_downloads(self, mock_yf):
+        """Test bulk market context uses two downloads and fills the cache."""
+        import pandas as pd
+        from market_data import MarketDataProvider, YFINANCE_AVAILABLE
+
+        if not YFINANCE_AVAILABLE:
+            pytest.skip("yfinance not available")
+
+        def columns(fields):
+            return pd.MultiIndex.from_tuples([(t, f) for t in ("AAPL", "MSFT") for f in fields])
+
+        daily = pd.DataFrame(
+            [[100.0, 200.0], [105.0, 190.0], [110.0, 180.0]], columns=columns(["Close"])
+        )
+        intraday = pd.DataFrame(
+            [[108.0, 108.0, 185.0, 185.0], [108.0, 113.4, 185.0, 180.0]],
+            columns=columns(["Open", "Close"]),
+        )
+        mock_yf.download.side_effect = [daily, intraday]
+
+        provider = MarketDataProvider({"enabled": True})
+        contexts = provider.get_market_context_bulk(["AAPL", "MSFT", "AAPL"])
+
+        assert mock_yf.download.call_count == 2
+        assert contexts["AAPL"]["current_price"] == 110.0
+        assert contexts["AAPL"]["week_change_pct"] == 10.0
+        assert contexts["AAPL"]["day_change_pct"] == 5.0
+        assert contexts["MSFT"]["week_change_pct"] == -10.0
+
+        # Second call is served entirely from the cache
+        again = provider.get_market_context_bulk(["AAPL", "MSFT"])
+        assert mock_yf.download.call_count == 2
+        assert again["AAPL"]["current_price"] == 110.0
+
+    @patch("market_data.yf")
+    def test_get_market_context_bulk_caches_missing_tickers(self, mock_yf):
+        """Test tickers without price data are not downloaded again within the TTL."""
+        import pandas as pd
+        from market_data import MarketDataProvider, YFINANCE_AVAILABLE
+
+        if not YFINANCE_AVAILABLE:
+            pytest.skip("yfinance not available")
+
+        mock_yf.download.return_value = pd.DataFrame()
+
+        provider = MarketDataProvider({"enabled": True})
+        assert provider.get_market_context_bulk(["PRIVATE"]) == {"PRIVATE": None}
+        assert mock_yf.download.call_count == 2
+
+        assert provider.get_market_context_bulk(["PRIVATE"]) == {"PRIVATE": None}
+        assert mock_yf.download.call_count == 2
+
     def test_is_significant_move_returns_none_when_disabled(self):
         """Test is_significant_move returns None when disabled."""
         from market_data import MarketDataProvider
@@ -2,6 +2,7 @@
 Unit tests for MLPatternDetector class.
 """
 
+import json
 import pytest
 import sys
 import os
@@ -22,7 +23,11 @@ except ImportError:
     SKLEARN_AVAILABLE = False
 
 # Import ml_detector module
-from ml_detector import MLPatternDetector, SKLEARN_AVAILABLE as MODULE_SKLEARN_AVAILABLE
+from ml_detector import (
+    CompanyFeatures,
+    MLPatternDetector,
+    SKLEARN_AVAILABLE as MODULE_SKLEARN_AVAILABLE,
+)
 
 
 @pytest.fixture
@@ -182,6 +187,46 @@ class TestFeatureExtraction:
         # Should use defaults for missing fields
         assert not any(np.isnan(features.flatten()))
 
+    def test_extract_features_batch_matches_single(
+        self, ml_config, sample_company_data, historical_training_data
+    ):
+        """Test batch extraction produces the same rows as per-company extraction."""
+        detector = MLPatternDetector(ml_config)
+        companies = [sample_company_data, {"ticker": "EMPTY"}] + historical_training_data[::7]
+
+        batch = detector.extract_features_batch(companies)
+
+        assert batch.shape == (len(companies), 17)
+        assert batch.dtype == np.float32
+        for row, data in zip(batch, companies):
+            np.testing.assert_allclose(row, detector.extract_features(data)[0], rtol=1e-6)
+
+    def test_extract_features_from_company_features(self, ml_config, sample_company_data):
+        """Test CompanyFeatures and dict inputs give the same features."""
+        detector = MLPatternDetector(ml_config)
+        now = datetime(2024, 1, 3, 15, 30)
+        company = CompanyFeatures(**sample_company_data)
+
+        np.testing.assert_array_equal(
+            detector.extract_features(company, now=now),
+            detector.extract_features(sample_company_data, now=now),
+        )
+        np.testing.assert_array_equal(
+            detector.extract_features_batch([company], now=now),
+            detector.extract_features_batch([sample_company_data], now=now),
+        )
+
+    def test_extract_features_uses_given_time(self, ml_config, sample_company_data):
+        """Test the time features come from the passed-in time."""
+        detector = MLPatternDetector(ml_config)
+        now = datetime(2024, 1, 3, 15, 30)  # A Wednesday
+
+        features = detector.extract_features(sample_company_data, now=now)
+        batch = detector.extract_features_batch([sample_company_data], now=now)
+
+        assert features[0, 8] == 15 and features[0, 9] == 2
+        np.testing.assert_array_equal(batch[0, 8:10], [15, 2])
+
 
 @pytest.mark.skipif(not SKLEARN_AVAILABLE, reason="scikit-learn not installed")
 class TestModelTraining:
@@ -197,6 +242,14 @@ class TestModelTraining:
         assert detector.training_sample_count == len(historical_training_data)
         assert detector.last_training_time is not None
 
+    def test_train_leaves_single_job_predict(self, ml_config, historical_training_data):
+        """Test the forests predict with one job after training."""
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+
+        assert detector.anomaly_detector.n_jobs == 1
+        assert detector.trend_classifier.n_jobs == 1
+
     def test_train_with_insufficient_data(self, ml_config):
         """Test training with insufficient data."""
         detector = MLPatternDetector(ml_config)
@@ -297,6 +350,69 @@ class TestPatternPrediction:
         assert 0 <= result["confidence"] <= 1
         assert result["prediction_class"] in [0, 1]
 
+    def test_fast_predict_matches_sklearn(self, ml_config, historical_training_data):
+        """Test the unvalidated predict paths agree with the sklearn methods."""
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+        features = detector.extract_features_batch(historical_training_data)
+        X = detector.scaler.transform(features)
+
+        np.testing.assert_allclose(detector._scale(features), X, rtol=1e-5, atol=1e-5)
+        single = detector.extract_features(historical_training_data[0])
+        assert detector._scale(single).dtype == np.float32
+
+        np.testing.assert_allclose(
+            detector._trend_proba(X), detector.trend_classifier.predict_proba(X)
+        )
+        np.testing.assert_allclose(
+            detector._anomaly_scores(X), detector.anomaly_detector.decision_function(X)
+        )
+
+    def test_threaded_anomaly_scores_match_sequential(
+        self, ml_config, historical_training_data, monkeypatch
+    ):
+        """Test large batches scored on threads agree with decision_function."""
+        import ml_detector
+
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+        X = detector._scale(detector.extract_features_batch(historical_training_data))
+        monkeypatch.setattr(ml_detector, "_SCORING_THREADS", 2)
+        monkeypatch.setattr(ml_detector, "_PARALLEL_SCORING_MIN_ROWS", 1)
+
+        np.testing.assert_allclose(
+            detector._anomaly_scores(X), detector.anomaly_detector.decision_function(X)
+        )
+
+    def test_scaled_row_reuses_scratch_buffer(
+        self, ml_config, historical_training_data, sample_company_data
+    ):
+        """Test single-company scaling matches _scale and reuses one buffer."""
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+
+        first = detector._scaled_row(sample_company_data)
+        np.testing.assert_allclose(
+            first,
+            detector._scale(detector.extract_features(sample_company_data)),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+        assert detector._scaled_row(historical_training_data[0]) is first
+
+    def test_trend_proba_matches_sklearn_off_training_data(
+        self, ml_config, historical_training_data
+    ):
+        """Test the packed trend forest agrees with sklearn on unseen rows."""
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+        X = np.random.default_rng(0).normal(scale=3.0, size=(100, 17)).astype(np.float32)
+
+        np.testing.assert_allclose(
+            detector._trend_proba(X), detector.trend_classifier.predict_proba(X)
+        )
+        assert detector._trend_forest is not None
+
     def test_predict_pattern_untrained(self, ml_config, sample_company_data):
         """Test pattern prediction with untrained model."""
         detector = MLPatternDetector(ml_config)
@@ -328,6 +444,34 @@ class TestCombinedMLScore:
         assert result["is_trained"] is True
         assert result["training_samples"] == len(historical_training_data)
 
+    def test_get_ml_score_batch_matches_single(
+        self, ml_config, historical_training_data, sample_company_data
+    ):
+        """Test batch scoring returns the same results as per-company scoring."""
+        detector = MLPatternDetector(ml_config)
+        detector.train(historical_training_data)
+        companies = [sample_company_data] + historical_training_data[::5]
+
+        results = detector.get_ml_score_batch(companies)
+
+        assert len(results) == len(companies)
+        for result, data in zip(results, companies):
+            expected = detector.get_ml_score(data)
+            assert result["ml_score"] == pytest.approx(expected["ml_score"], abs=1e-4)
+            assert (
+                result["anomaly_result"]["is_anomaly"] == expected["anomaly_result"]["is_anomaly"]
+            )
+            assert result["pattern_result"] == pytest.approx(expected["pattern_result"], abs=1e-4)
+
+    def test_get_ml_score_batch_untrained(self, ml_config, sample_company_data):
+        """Test batch scoring with untrained models falls back to error results."""
+        detector = MLPatternDetector(ml_config)
+
+        results = detector.get_ml_score_batch([sample_company_data])
+
+        assert results[0]["ml_score"] == 0.0
+        assert "error" in results[0]["anomaly_result"]
+
 
 @pytest.mark.skipif(not SKLEARN_AVAILABLE, reason="scikit-learn not installed")
 class TestModelPersistence:
@@ -354,6 +498,30 @@ class TestModelPersistence:
             assert load_success is True
             assert detector2.is_trained is True
             assert detector2.training_sample_count == len(historical_training_data)
+            assert os.path.exists(model_path + ".scaler.npz")
+            np.testing.assert_allclose(detector2._mean, detector1.scaler.mean_, rtol=1e-6)
+            np.testing.assert_allclose(detector2._inv_scale, 1 / detector1.scaler.scale_, rtol=1e-6)
+
+    def test_resave_after_load_keeps_mapped_model(self, ml_config, historical_training_data):
+        """Test re-saving over a loaded, memory-mapped model leaves its arrays readable."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ml_config["ml_detection"]["model_path"] = os.path.join(tmpdir, "test_model.pkl")
+
+            detector1 = MLPatternDetector(ml_config)
+            detector1.train(historical_training_data)
+            assert detector1.save_model() is True
+
+            # No positive labels, so the loaded trend classifier isn't refit
+            # and keeps the arrays mapped from the saved file
+            detector2 = MLPatternDetector(ml_config)
+            assert detector2.load_model() is True
+            classes = detector2.trend_classifier.classes_.copy()
+            detector2.train([{**data, "had_alert": False} for data in historical_training_data])
+
+            assert detector2.save_model() is True
+            np.testing.assert_array_equal(detector2.trend_classifier.classes_, classes)
+            assert MLPatternDetector(ml_config).load_model() is True
+            assert not os.path.exists(ml_config["ml_detection"]["model_path"] + ".tmp")
 
     def test_save_untrained_model(self, ml_config):
         """Test saving untrained model fails gracefully."""
@@ -428,6 +596,30 @@ class TestAutoTraining:
                 assert success is True
                 assert detector.is_trained is True
 
+    def test_auto_train_skips_unchanged_data(self, ml_config, historical_training_data, tmp_path):
+        """Test a due retrain is skipped when the mention window hasn't changed."""
+        from database import Database
+
+        db = Database(str(tmp_path / "news.db"))
+        detector = MLPatternDetector(ml_config)
+        detector.model_path = str(tmp_path / "model.pkl")
+
+        with patch.object(
+            detector, "_fetch_historical_data", return_value=historical_training_data
+        ) as mock_fetch:
+            assert detector.auto_train_if_ready(db) is True
+            detector.last_training_time = datetime.now() - timedelta(days=2)
+
+            assert detector.auto_train_if_ready(db) is False
+            assert mock_fetch.call_count == 1
+
+            assert detector.auto_train_if_ready(db, force=True) is True
+            assert mock_fetch.call_count == 2
+
+        reloaded = MLPatternDetector(ml_config)
+        assert reloaded.load_model(detector.model_path)
+        assert reloaded._last_training_fingerprint == detector._last_training_fingerprint
+
 
 class TestMLDetectorDisabled:
     """Tests for when sklearn is not available."""
@@ -441,6 +633,19 @@ class TestMLDetectorDisabled:
             result = detector.detect_anomalies({"ticker": "TEST"})
             assert result["is_anomaly"] is False
 
+    def test_untrained_results_are_fresh_dicts(self, disabled_ml_config, sample_company_data):
+        """Test callers can change and serialize the results of an untrained detector."""
+        detector = MLPatternDetector(disabled_ml_config)
+
+        score = detector.get_ml_score(sample_company_data)
+        score["anomaly_result"]["is_anomaly"] = True
+        json.dumps(score)
+
+        assert detector.get_ml_score(sample_company_data)["anomaly_result"]["is_anomaly"] is False
+        batch = detector.get_ml_score_batch([sample_company_data] * 2)
+        assert batch[0] is not batch[1]
+        assert type(detector.predict_pattern(sample_company_data)) is dict
+
 
 @pytest.mark.skipif(not SKLEARN_AVAILABLE, reason="scikit-learn not installed")
 class TestIntegrationWithPatternDetector:
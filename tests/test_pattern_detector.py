@@ -11,7 +11,30 @@ from datetime import datetime, timedelta
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from pattern_detector import PatternDetector, PatternAlert
+from pattern_detector import PatternDetector, PatternAlert, _mean_std
+
+
+def mock_window_counts(mock_database, counts_by_ticker):
+    """
+    Serve per-company test counts from the batched count queries.
+
+    Each ticker maps to (volume_counts, momentum_counts): the 6h, 24h and 7d
+    counts, then the cumulative counts at 1 to 7 days, which are served as
+    daily counts.
+    """
+    windows = {}
+    daily = {}
+    for ticker, (volume_counts, momentum_counts) in counts_by_ticker.items():
+        windows[ticker] = dict(zip((6, 24, 168), volume_counts))
+        daily[ticker] = [
+            count - previous for count, previous in zip(momentum_counts, [0, *momentum_counts])
+        ]
+
+    def get_counts(hours, tickers=None, now=None):
+        return {ticker: [counts.get(h, 0) for h in hours] for ticker, counts in windows.items()}
+
+    mock_database.get_article_counts_by_company.side_effect = get_counts
+    mock_database.get_daily_counts.return_value = daily
 
 
 class TestPatternAlert:
@@ -34,6 +57,7 @@ class TestPatternAlert:
         assert alert.severity == "high"
         assert alert.message == "Test alert message"
         assert alert.details == {"key": "value"}
+        assert not hasattr(alert, "__dict__")
 
     def test_pattern_alert_to_dict(self):
         """Test PatternAlert serialization."""
@@ -56,6 +80,48 @@ class TestPatternAlert:
         assert alert_dict["details"] == {"shift": 0.5}
         assert "timestamp" in alert_dict
 
+    def test_pattern_alert_timestamp_set_at_creation(self):
+        """Test the serialized timestamp is when the alert was created."""
+        before = datetime.now()
+        alert = PatternAlert(
+            pattern_type="momentum",
+            ticker="MSFT",
+            company_name="Microsoft",
+            severity="medium",
+            message="Building momentum",
+            details={},
+        )
+
+        assert before <= alert.timestamp <= datetime.now()
+        assert alert.to_dict()["timestamp"] == alert.timestamp.isoformat()
+        assert alert.to_dict()["timestamp"] == alert.to_dict()["timestamp"]
+
+
+class TestMeanStd:
+    """Tests for the sentiment statistics helper."""
+
+    def test_mean_std_matches_population_std(self):
+        """Test mean and population standard deviation of several values."""
+        import statistics
+
+        values = [0.5, -0.2, 0.9, 0.1]
+        mean, std = _mean_std(values)
+
+        assert mean == pytest.approx(statistics.fmean(values))
+        assert std == pytest.approx(statistics.pstdev(values))
+
+    def test_mean_std_short_inputs(self):
+        """Test an empty list and a single value."""
+        assert _mean_std([]) == (0, 0)
+        assert _mean_std([0.4]) == (0.4, 0)
+
+    def test_mean_std_accepts_generator(self):
+        """Test values can be streamed from a generator."""
+        values = [0.3, -0.6, 0.1]
+
+        assert _mean_std(v for v in values) == pytest.approx(_mean_std(values))
+        assert _mean_std(iter([])) == (0, 0)
+
 
 class TestPatternDetectorVolumeSpike:
     """Tests for volume spike detection."""
@@ -67,13 +133,13 @@ class TestPatternDetectorVolumeSpike:
             {"company_ticker": "AAPL", "company_name": "Apple", "count": 20}
         ]
 
-        # Volume spike: 3 calls + Momentum: 7 calls = 10 total
+        # Volume spike: 3 counts + Momentum: 7 counts
         # For high spike: 6h=10, 24h=15, 7d=28 (avg=4/day, expected_6h=1, spike=10x)
         volume_counts = [10, 15, 28]
         # Momentum: cumulative for days 1-7 (need 7 values showing no increasing trend)
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -100,7 +166,7 @@ class TestPatternDetectorVolumeSpike:
         volume_counts = [4, 8, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -124,7 +190,7 @@ class TestPatternDetectorVolumeSpike:
         volume_counts = [1, 4, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -145,7 +211,7 @@ class TestPatternDetectorVolumeSpike:
         volume_counts = [2, 6, 10]
         momentum_counts = [10, 10, 10, 10, 10, 10, 10]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -187,7 +253,7 @@ class TestPatternDetectorSentimentShift:
         # No volume spike
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -218,7 +284,7 @@ class TestPatternDetectorSentimentShift:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -245,7 +311,7 @@ class TestPatternDetectorSentimentShift:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -275,7 +341,7 @@ class TestPatternDetectorSentimentShift:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -316,7 +382,7 @@ class TestPatternDetectorMomentum:
         # Pattern: daily[0]=6, daily[1]=4, daily[2]=2 -> 6 > 4 > 2, so momentum!
         momentum_counts = [6, 10, 12, 14, 16, 18, 20]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -338,7 +404,7 @@ class TestPatternDetectorMomentum:
         # cumulative day0=2, day1=6 (daily=4), day2=12 (daily=6)
         momentum_counts = [2, 6, 12, 18, 24, 30, 36]
 
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -360,7 +426,7 @@ class TestPatternDetectorNegativeCluster:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -383,7 +449,7 @@ class TestPatternDetectorNegativeCluster:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -406,7 +472,7 @@ class TestPatternDetectorNegativeCluster:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         # Articles with specific negative keywords
         articles_with_keywords = [
@@ -433,6 +499,34 @@ class TestPatternDetectorNegativeCluster:
                 kw in keywords for kw in ["investigation", "fraud", "scandal", "layoffs", "crash"]
             )
 
+    def test_negative_cluster_keyword_order(self, mock_database, sample_config, negative_articles):
+        """Test keywords are listed by article, then keyword order, and match inside words."""
+        detector = PatternDetector(mock_database, sample_config)
+
+        with patch.object(detector, "_get_company_articles", return_value=negative_articles):
+            alert = detector._detect_negative_cluster("AAPL", "Apple")
+
+        # "crashes" counts as "crash"; "bankruptcy" is cut by the five-keyword cap
+        assert alert.details["keywords"] == [
+            "investigation",
+            "scandal",
+            "fraud",
+            "crash",
+            "lawsuit",
+        ]
+
+    def test_negative_cluster_configured_keywords(
+        self, mock_database, sample_config, negative_articles
+    ):
+        """Test configured keywords replace the defaults, matched case-insensitively."""
+        config = {**sample_config, "negative_cluster_keywords": ["Downgrade", "legal", "fraud"]}
+        detector = PatternDetector(mock_database, config)
+
+        with patch.object(detector, "_get_company_articles", return_value=negative_articles):
+            alert = detector._detect_negative_cluster("AAPL", "Apple")
+
+        assert alert.details["keywords"] == ["fraud", "downgrade", "legal"]
+
     def test_no_negative_cluster_when_not_majority_negative(
         self, mock_database, sample_config, positive_articles
     ):
@@ -443,7 +537,7 @@ class TestPatternDetectorNegativeCluster:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         detector = PatternDetector(mock_database, sample_config)
 
@@ -466,7 +560,7 @@ class TestPatternDetectorNegativeCluster:
 
         volume_counts = [1, 2, 28]
         momentum_counts = [28, 28, 28, 28, 28, 28, 28]
-        mock_database.get_article_count_for_company.side_effect = volume_counts + momentum_counts
+        mock_window_counts(mock_database, {"AAPL": (volume_counts, momentum_counts)})
 
         # Only 1 article
         single_article = [{"id": 1, "content": "Investigation and scandal."}]
@@ -560,7 +654,7 @@ class TestPatternDetectorIntegration:
             {"company_ticker": "TSLA", "company_name": "Tesla", "count": 10},
         ]
 
-        # Each company needs 10 calls: 3 volume + 7 momentum
+        # Each company has 3 volume and 7 momentum counts
         # AAPL: volume spike
         aapl_volume = [10, 15, 28]
         aapl_momentum = [28, 28, 28, 28, 28, 28, 28]
@@ -568,8 +662,9 @@ class TestPatternDetectorIntegration:
         tsla_volume = [1, 2, 20]
         tsla_momentum = [20, 20, 20, 20, 20, 20, 20]
 
-        mock_database.get_article_count_for_company.side_effect = (
-            aapl_volume + aapl_momentum + tsla_volume + tsla_momentum
+        mock_window_counts(
+            mock_database,
+            {"AAPL": (aapl_volume, aapl_momentum), "TSLA": (tsla_volume, tsla_momentum)},
         )
 
         detector = PatternDetector(mock_database, sample_config)
@@ -595,3 +690,316 @@ class TestPatternDetectorIntegration:
         assert len(aapl_alerts) >= 1
         aapl_volume_alerts = [a for a in aapl_alerts if a.pattern_type == "volume_spike"]
         assert len(aapl_volume_alerts) >= 1
+
+    def test_market_context_applied_per_company(self, mock_database, sample_config):
+        """Test each company's alerts carry that company's market context."""
+        mock_database.get_mention_counts.return_value = [
+            {"company_ticker": "AAPL", "company_name": "Apple", "count": 10},
+            {"company_ticker": "TSLA", "company_name": "Tesla", "count": 10},
+        ]
+        spike = ([10, 15, 28], [28] * 7)
+        mock_window_counts(mock_database, {"AAPL": spike, "TSLA": spike})
+
+        detector = PatternDetector(mock_database, sample_config)
+        detector.market_data = MagicMock()
+        detector.market_data_enabled = True
+        detector.market_data.get_market_context_bulk.side_effect = lambda tickers: {
+            ticker: {"ticker": ticker, "day_change_pct": 1.0} for ticker in tickers
+        }
+
+        with patch.object(detector, "_get_company_articles", return_value=[]):
+            alerts = detector.detect_all_patterns()
+
+        assert {a.ticker for a in alerts} == {"AAPL", "TSLA"}
+        assert all(a.market_context["ticker"] == a.ticker for a in alerts)
+        detector.market_data.get_market_context_bulk.assert_called_once_with(["AAPL", "TSLA"])
+        detector.market_data.get_market_context.assert_not_called()
+
+    def test_article_detectors_skipped_without_articles(self, mock_database, sample_config):
+        """Test companies with no articles this week skip the article-based detectors."""
+        mock_database.get_mention_counts.return_value = [
+            {"company_ticker": "AAPL", "company_name": "Apple", "count": 10}
+        ]
+        mock_window_counts(mock_database, {"AAPL": ([10, 15, 28], [28] * 7)})
+        mock_database.get_articles_for_companies.return_value = {}
+
+        detector = PatternDetector(mock_database, sample_config)
+
+        with (
+            patch.object(detector, "_detect_sentiment_shift") as sentiment,
+            patch.object(detector, "_detect_negative_cluster") as negative,
+        ):
+            alerts = detector.detect_all_patterns()
+
+        assert [a.pattern_type for a in alerts] == ["volume_spike"]
+        sentiment.assert_not_called()
+        negative.assert_not_called()
+
+    def test_market_download_overlaps_article_prefetch(self, mock_database, sample_config):
+        """Test the market data download runs while the articles are fetched."""
+        import threading
+
+        mock_database.get_mention_counts.return_value = [
+            {"company_ticker": "AAPL", "company_name": "Apple", "count": 10}
+        ]
+        mock_window_counts(mock_database, {"AAPL": ([1, 2, 3], [1] * 7)})
+
+        detector = PatternDetector(mock_database, sample_config)
+        detector.market_data = MagicMock()
+        detector.market_data_enabled = True
+        downloading = threading.Event()
+
+        def download(tickers):
+            downloading.set()
+            return {}
+
+        def prefetch(tickers, since, columns=None):
+            # Only returns if the download started without waiting for this
+            assert downloading.wait(timeout=5)
+            return {}
+
+        detector.market_data.get_market_context_bulk.side_effect = download
+        mock_database.get_articles_for_companies.side_effect = prefetch
+
+        assert detector.detect_all_patterns() == []
+
+    def test_run_uses_one_reference_time(self, mock_database, sample_config):
+        """Test every query of a run ends its windows at the same time."""
+        mock_database.get_mention_counts.return_value = [
+            {"company_ticker": "AAPL", "company_name": "Apple", "count": 10}
+        ]
+        mock_window_counts(mock_database, {"AAPL": ([1, 2, 3], [1] * 7)})
+        mock_database.get_articles_for_companies.return_value = {}
+
+        detector = PatternDetector(mock_database, sample_config)
+        detector.detect_all_patterns()
+
+        now = mock_database.get_daily_counts.call_args.kwargs["now"]
+        since = mock_database.get_articles_for_companies.call_args.args[1]
+        assert mock_database.get_article_counts_by_company.call_args.kwargs["now"] == now
+        assert now - since == timedelta(hours=168)
+        assert detector._run_now is None
+
+    def test_iter_patterns_yields_per_company(self, mock_database, sample_config):
+        """Test alerts are yielded before later companies are checked."""
+        mock_database.get_mention_counts.return_value = [
+            {"company_ticker": "AAPL", "company_name": "Apple", "count": 10},
+            {"company_ticker": "TSLA", "company_name": "Tesla", "count": 10},
+        ]
+        mock_window_counts(
+            mock_database,
+            {"AAPL": ([10, 15, 28], [28] * 7), "TSLA": ([10, 15, 28], [28] * 7)},
+        )
+        mock_database.get_articles_for_companies.return_value = {}
+
+        detector = PatternDetector(mock_database, sample_config)
+        with patch.object(
+            detector, "_detect_volume_spike", wraps=detector._detect_volume_spike
+        ) as volume_spike:
+            patterns = detector.iter_patterns()
+            first = next(patterns)
+            assert first.ticker == "AAPL"
+            assert volume_spike.call_count == 1
+            assert detector._run_now is not None
+
+            patterns.close()
+
+        assert detector._run_now is None
+        assert detector._articles_by_ticker is None
+
+
+class TestPatternDetectorPrefetch:
+    """Tests for the per-run article prefetch against a real database."""
+
+    def test_prefetched_windows_match_queries(self, tmp_path, sample_config):
+        """Test windows sliced from the prefetch match the per-window queries."""
+        from database import Article, Database
+
+        db = Database(str(tmp_path / "news.db"))
+        now = datetime.now()
+        items = [
+            (
+                Article(
+                    id=None,
+                    url=f"https://example.com/{hours}",
+                    title=f"Apple story {hours}",
+                    content=f"Apple news from {hours} hours ago",
+                    source="test",
+                    published_at=now - timedelta(hours=hours, minutes=30),
+                    scraped_at=now,
+                ),
+                [("AAPL", "Apple", "Apple news")],
+            )
+            for hours in (1, 5, 12, 30, 47, 100, 200)
+        ]
+        db.save_articles_with_mentions_batch(items)
+
+        detector = PatternDetector(db, sample_config)
+        windows = [(6, 0), (24, 0), (48, 24), (168, 24)]
+        expected = [detector._get_company_articles("AAPL", h, e) for h, e in windows]
+
+        detector._prefetch_articles(["AAPL", "MSFT"])
+        sliced = [detector._get_company_articles("AAPL", h, e) for h, e in windows]
+
+        assert [[a["id"] for a in rows] for rows in sliced] == [
+            [a["id"] for a in rows] for rows in expected
+        ]
+        assert [len(rows) for rows in sliced] == [2, 3, 2, 3]
+        assert set(sliced[0][0]) == {"id", "content", "published_at", "sentiment_score"}
+        assert detector._get_company_articles("MSFT", 24) == []
+
+        # Empty, whole-prefetch and inverted windows
+        detector._articles_by_ticker = None
+        edge_windows = [(1, 0), (168, 0), (30, 10), (10, 30)]
+        expected = [detector._get_company_articles("AAPL", h, e) for h, e in edge_windows]
+        detector._prefetch_articles(["AAPL"])
+        assert [detector._get_company_articles("AAPL", h, e) for h, e in edge_windows] == expected
+
+
+class TestBatchedCounts:
+    """Tests for the batched count queries against a real database."""
+
+    def test_daily_counts_match_cumulative_differences(self, tmp_path):
+        """Test per-day counts equal differences of the cumulative window counts."""
+        from database import Article, Database
+
+        db = Database(str(tmp_path / "news.db"))
+        now = datetime.now()
+        hours_ago = [2, 5, 20, 30, 40, 50, 75, 100, 160, 200]
+        ids = db.save_articles_with_mentions_batch(
+            [
+                (
+                    Article(
+                        id=None,
+                        url=f"https://example.com/{hours}",
+                        title=f"Apple story {hours}",
+                        content=f"Apple news from {hours} hours ago",
+                        source="test",
+                        published_at=now,
+                        scraped_at=now,
+                    ),
+                    [("AAPL", "Apple", "Apple news")],
+                )
+                for hours in hours_ago
+            ]
+        )
+        with db.get_connection() as conn:
+            conn.executemany(
+                "UPDATE company_mentions SET mentioned_at = ? WHERE article_id = ?",
+                [(now - timedelta(hours=h), i) for h, i in zip(hours_ago, ids)],
+            )
+
+        cumulative = [db.get_article_count_for_company("AAPL", hours=24 * d) for d in range(1, 8)]
+        expected = [c - p for c, p in zip(cumulative, [0, *cumulative])]
+
+        assert db.get_daily_counts(days=7, tickers=["AAPL"]) == {"AAPL": expected}
+        assert expected == [3, 2, 1, 1, 1, 0, 1]
+
+        # The same mentions, counted over several windows in one query
+        hours = (6, 24, 48, 168)
+        assert db.get_article_counts_by_company(hours, ["AAPL", "MSFT"]) == {
+            "AAPL": [db.get_article_count_for_company("AAPL", hours=h) for h in hours]
+        }
+
+
+class TestArticleSentiments:
+    """Tests for per-run article sentiment scoring."""
+
+    def test_scores_each_article_once(self, mock_database, sample_config, negative_articles):
+        """Test articles read twice are scored once, and saved scores are reused."""
+        detector = PatternDetector(mock_database, sample_config)
+        saved = {"id": 99, "content": "Record profit growth", "sentiment_score": 0.25}
+
+        with patch.object(
+            detector.sentiment_analyzer,
+            "analyze_many",
+            wraps=detector.sentiment_analyzer.analyze_many,
+        ) as analyze_many:
+            first = list(detector._article_sentiments(negative_articles))
+            second = list(detector._article_sentiments([saved, *negative_articles]))
+
+        assert analyze_many.call_count == 1
+        assert second == [0.25, *first]
+
+    def test_sentiment_stats_shared_within_run(
+        self, mock_database, sample_config, negative_articles
+    ):
+        """Test a window's sentiment stats are computed once per run."""
+        detector = PatternDetector(mock_database, sample_config)
+        detector._articles_by_ticker = {"AAPL": negative_articles}
+
+        with patch.object(
+            detector, "_get_company_articles", return_value=negative_articles
+        ) as get_articles:
+            first = detector._sentiment_stats("AAPL", hours=24)
+            second = detector._sentiment_stats("AAPL", hours=24)
+
+        assert get_articles.call_count == 1
+        assert first == second
+        assert first[0] == len(negative_articles)
+        assert first[1] < 0
+
+    def test_large_window_stats_match(self, mock_database, sample_config, negative_articles):
+        """Test numpy stats for large windows match the one-pass stats."""
+        detector = PatternDetector(mock_database, sample_config)
+        expected = _mean_std(detector._article_sentiments(negative_articles))
+
+        with patch("pattern_detector._NUMPY_STATS_MIN_ARTICLES", 1):
+            with patch.object(detector, "_get_company_articles", return_value=negative_articles):
+                count, mean, std = detector._sentiment_stats("AAPL", hours=24)
+
+        assert count == len(negative_articles)
+        assert (mean, std) == pytest.approx(expected)
+
+    def test_article_keywords_found_once(self, mock_database, sample_config, negative_articles):
+        """Test an article's negative keywords are scanned once and kept by id."""
+        detector = PatternDetector(mock_database, sample_config)
+        article = negative_articles[0]
+
+        found = detector._article_keywords(article)
+        rescanned = detector._article_keywords({**article, "content": "No keywords"})
+
+        assert found == {"investigation", "fraud", "scandal"}
+        assert rescanned is found
+        assert detector._article_keywords({"content": None}) == frozenset()
+
+    def test_article_caches_kept_across_runs(self, mock_database, sample_config):
+        """Test scores and keywords outlive a run, bounded by dropping the oldest."""
+        mock_database.get_mention_counts.return_value = []
+        detector = PatternDetector(mock_database, sample_config)
+        detector._sentiment_cache.update({1: 0.1, 2: 0.2, 3: 0.3, None: 0.0})
+        detector._keyword_cache.update({1: frozenset(), 2: frozenset({"fraud"})})
+
+        with patch("pattern_detector._ARTICLE_CACHE_SIZE", 2):
+            detector.detect_all_patterns()
+
+        assert detector._sentiment_cache == {2: 0.2, 3: 0.3}
+        assert detector._keyword_cache == {1: frozenset(), 2: frozenset({"fraud"})}
+
+    def test_prefetched_articles_scored_in_one_batch(self, mock_database, sample_config):
+        """Test shared articles are scored once, in one batch, up to the horizon."""
+        detector = PatternDetector(mock_database, sample_config)
+        detector._run_now = datetime.now()
+
+        def article(article_id, hours, score=None):
+            published = detector._run_now - timedelta(hours=hours)
+            return {
+                "id": article_id,
+                "content": f"Story {article_id}",
+                "published_at": published.isoformat(" "),
+                "sentiment_score": score,
+            }
+
+        shared = article(1, 2)
+        detector._articles_by_ticker = {
+            "AAPL": [shared, article(2, 10, score=0.5), article(3, 100)],
+            "MSFT": [shared, article(4, 30)],
+        }
+
+        with patch.object(
+            detector.sentiment_analyzer, "analyze_many", return_value=[0.1, 0.2]
+        ) as analyze_many:
+            detector._score_prefetched_articles()
+
+        analyze_many.assert_called_once_with(["Story 1", "Story 4"])
+        assert detector._sentiment_cache == {1: 0.1, 4: 0.2}
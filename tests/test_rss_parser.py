@@ -0,0 +1,149 @@
+"""
+Unit tests for the RSS and Atom feed parser.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import feedparser
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rss_parser import parse_feed
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+    <channel>
+        <title>Test Feed</title>
+        <link>http://example.com</link>
+        <item>
+            <title>Apple &amp; Tesla report</title>
+            <link>http://example.com/article1</link>
+            <description><![CDATA[<p>Summary of <b>article 1</b></p>]]></description>
+            <content:encoded><![CDATA[<p>Full text of article 1</p>]]></content:encoded>
+            <pubDate>Wed, 15 Jan 2025 14:30:00 GMT</pubDate>
+        </item>
+        <item>
+            <title>Second article</title>
+            <link>http://example.com/article2</link>
+            <description>Plain summary</description>
+        </item>
+    </channel>
+</rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Test Atom Feed</title>
+    <entry>
+        <title>Atom article</title>
+        <link rel="self" href="http://example.com/self"/>
+        <link rel="alternate" href="http://example.com/atom1"/>
+        <updated>2025-01-15T14:30:00Z</updated>
+        <summary>Atom summary</summary>
+        <content type="html">&lt;p&gt;Atom content&lt;/p&gt;</content>
+    </entry>
+</feed>"""
+
+
+class TestParseFeed:
+    """Tests for parse_feed."""
+
+    def test_rss_entries_match_feedparser(self):
+        """Test RSS entries carry the fields feedparser gives them."""
+        with patch("rss_parser.feedparser.parse") as fallback:
+            entries = parse_feed(RSS_FEED).entries
+        expected = feedparser.parse(RSS_FEED).entries
+
+        fallback.assert_not_called()
+        assert len(entries) == 2
+        for entry, reference in zip(entries, expected):
+            assert entry.link == reference.link
+            assert entry.title == reference.title
+            assert entry.summary == reference.summary
+        assert entries[0].title == "Apple & Tesla report"
+        assert entries[0].published == expected[0].published
+        assert entries[0].content[0].value == expected[0].content[0].value
+        assert not hasattr(entries[1], "published")
+        assert not hasattr(entries[1], "content")
+
+    def test_rss_text_fields_stripped(self):
+        """Test whitespace around text fields is stripped, as feedparser does."""
+        padded = b"""<rss version="2.0"><channel><item>
+            <title> Padded title </title>
+            <link> http://example.com/padded </link>
+            <description>  Padded summary  </description>
+        </item></channel></rss>"""
+
+        entry = parse_feed(padded).entries[0]
+        reference = feedparser.parse(padded).entries[0]
+
+        assert entry.link == reference.link == "http://example.com/padded"
+        assert entry.title == reference.title
+        assert entry.summary == reference.summary
+
+    def test_rss_permalink_guid_used_as_link(self):
+        """Test an item without <link> takes its permalink guid, as with feedparser."""
+        guids = b"""<rss version="2.0"><channel>
+            <item><title>Permalink</title>
+                <guid isPermaLink="true">http://example.com/guid1</guid></item>
+            <item><title>Default</title><guid>http://example.com/guid2</guid></item>
+            <item><title>Not a link</title>
+                <guid isPermaLink="false">http://example.com/guid3</guid></item>
+            <item><title>Both</title><guid>http://example.com/guid4</guid>
+                <link>http://example.com/link4</link></item>
+        </channel></rss>"""
+
+        links = [entry.get("link") for entry in parse_feed(guids).entries]
+
+        assert links == [entry.get("link") for entry in feedparser.parse(guids).entries]
+        assert links == [
+            "http://example.com/guid1",
+            "http://example.com/guid2",
+            None,
+            "http://example.com/link4",
+        ]
+
+    def test_atom_entry_fields(self):
+        """Test Atom entries take their alternate link and text fields."""
+        entry = parse_feed(ATOM_FEED).entries[0]
+
+        assert entry.link == "http://example.com/atom1"
+        assert entry.title == "Atom article"
+        assert entry.updated == "2025-01-15T14:30:00Z"
+        assert entry.summary == "Atom summary"
+        assert entry.content[0].value == "<p>Atom content</p>"
+        assert not hasattr(entry, "published")
+
+    def test_max_entries(self):
+        """Test only the first entries are returned."""
+        assert [e.link for e in parse_feed(RSS_FEED, max_entries=1).entries] == [
+            "http://example.com/article1"
+        ]
+
+    def test_malformed_feed_falls_back_to_feedparser(self):
+        """Test feeds that aren't well-formed XML are parsed by feedparser."""
+        malformed = RSS_FEED.replace(b"&amp;", b"&")
+
+        entries = parse_feed(malformed).entries
+
+        assert [e.link for e in entries] == [
+            "http://example.com/article1",
+            "http://example.com/article2",
+        ]
+
+    def test_rdf_feed_falls_back_to_feedparser(self):
+        """Test RSS 1.0 feeds, which have namespaced items, use feedparser."""
+        rdf = b"""<?xml version="1.0"?>
+        <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+                 xmlns="http://purl.org/rss/1.0/">
+            <channel rdf:about="http://example.com"><title>RDF</title></channel>
+            <item rdf:about="http://example.com/rdf1">
+                <title>RDF article</title>
+                <link>http://example.com/rdf1</link>
+            </item>
+        </rdf:RDF>"""
+
+        entries = parse_feed(rdf).entries
+
+        assert [e.link for e in entries] == ["http://example.com/rdf1"]
@@ -543,6 +543,30 @@ class TestRSSScraper:
         assert articles[0].url == "http://example.com/article1"
         assert articles[0].source == "TestSource"
 
+    @patch("scraper.get_http_cache")
+    def test_scrapers_share_session(self, mock_cache, scraper_config, global_config):
+        """Test scrapers share one session and send their own headers per request."""
+        mock_cache_instance = Mock()
+        mock_cache_instance.get_cache_headers.return_value = {"If-None-Match": '"abc"'}
+        mock_cache.return_value = mock_cache_instance
+
+        scraper = RSSScraper(scraper_config, global_config)
+        other = RSSScraper(scraper_config, {**global_config, "user_agents": ["Other/2.0"]})
+
+        assert scraper.session is other.session
+        assert "TestUserAgent/1.0" not in scraper.session.headers.values()
+
+        mock_response = Mock(status_code=304)
+        with patch.object(scraper.session, "get", return_value=mock_response) as mock_get:
+            scraper._fetch_feed_with_cache("http://example.com/feed.rss")
+            other._fetch("http://example.com/page")
+
+        feed_headers = mock_get.call_args_list[0].kwargs["headers"]
+        assert feed_headers["User-Agent"] == "TestUserAgent/1.0"
+        assert feed_headers["If-None-Match"] == '"abc"'
+        assert "If-None-Match" not in scraper.headers
+        assert mock_get.call_args_list[1].kwargs["headers"]["User-Agent"] == "Other/2.0"
+
     @patch("scraper.get_http_cache")
     @patch("scraper.get_domain_rate_limiter")
     @patch("scraper.get_feed_health_tracker")
@@ -278,7 +278,7 @@ if MARKET_DATA_AVAILABLE:
     market_config = config.get('market_data', {})
     if market_config.get('enabled', False):
         try:
-            market_data_provider = MarketDataProvider(market_config)
+            market_data_provider = MarketDataProvider(market_config, db=db)
             correlation_analyzer = CorrelationAnalyzer(db, market_data_provider, market_config)
             logger.info("Market data and correlation analyzer initialized")
         except Exception as e: